@@ -4,6 +4,10 @@
 from datetime import datetime, timedelta
 from shipstation_automation.utils.utils import get_ship_date
 
+
+# Item fields kept per line item on multi-item shipments
+_ITEM_KEYS = ("imageUrl", "lineItemKey", "name", "orderItemId", "productId", "quantity", "sku", "warehouseLocation", "taxAmount", "unitPrice", "upc")
+
 class Order:
     """
         This class represents an order from the ShipStation API. It contains the order details such as shipment info, customer info, order id, order number, order status, order total, contains alcohol, order source, order store id, order warehouse id, carrier code, and create date.
@@ -51,7 +55,9 @@ class Order:
         self.is_double_order    = False
         self.rates              = {}
         self.winning_rate       = {}
-        self.mapping_services   = {}
+        self.fedex_best_rate    = None  # Set by the batch FedEx prefetch in main
+        self.fedex_rate_fetched = False
+        self.mapping_services   = {}    # (carrierCode, serviceName) -> serviceCode
 
 
 class Shipment:
@@ -110,16 +116,8 @@ class Shipment:
             self.item_unit_price = items_list[0]["unitPrice"]
             self.item_upc = items_list[0]["upc"]
         elif items_list is not None and len(items_list) > 1:
-            self.items_dict = {}
-            for idx in range(len(items_list)):
-                # Get the item at the current index
-                item = items_list[idx]
-                if not item.get('adjustment', False):
-                    # Create a dictionary with selected keys
-                    list_of_infos_about_the_item = {
-                        key: item.get(key) for key in ["imageUrl", "lineItemKey", "name", "orderItemId", "productId", "quantity", "sku", "warehouseLocation", "taxAmount", "unitPrice", "upc"]
-                    }
-                    self.items_dict[idx] = list_of_infos_about_the_item
+            # items_list is already free of adjustments; fields missing from an item stay None
+            self.items_dict = {idx: {key: item.get(key) for key in _ITEM_KEYS} for idx, item in enumerate(items_list)}
 
         self.requested_shipping_service = requestedService
         self.shipping_service_code = serviceCode
@@ -143,6 +141,7 @@ class Customer:
         self.phone          = ship_to_dict["phone"]
         self.postal_code    = ship_to_dict["postalCode"]
         self.state          = ship_to_dict["state"]
+        self.state_upper    = (self.state or "").upper() # Upper-cased once for state code checks
         self.address1       = ship_to_dict["street1"]
         self.address2       = ship_to_dict["street2"] # This could be empty
         self.address3       = ship_to_dict["street3"] # This could be empty
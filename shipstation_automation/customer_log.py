@@ -2,6 +2,31 @@
 import boto3, botocore
 import csv
 import os
+from collections import namedtuple
+
+
+# Column order of the customer data CSV
+_FIELDNAMES = (
+    "Customer ID", "Order Source", "Store Name", "Shipstation", "Order Date", "Order Number",
+    "Amount Paid", "Customer Name", "Street1", "Street2", "City", "State", "Country", "Zip",
+    "Phone", "Email"
+)
+
+# One CSV row per order; positional fields avoid building a dict for every order
+CustomerRow = namedtuple("CustomerRow", [name.replace(" ", "_") for name in _FIELDNAMES])
+
+_STORE_MAPPING = {
+    165397 : "Nuveau Amazon",
+    399784 : "Lentics Amazon",
+    399912 : "Gift Haven Amazon",
+    399729 : "3D Art Co Etsy",
+    165604 : "Nuveau Etsy"
+}
+
+# ETag and local path of the CSV last written by this (warm) Lambda container.
+# A conditional GET against this ETag skips re-downloading an unchanged object.
+_LAST_ETAG = None
+_CACHED_CSV_PATH = None
 
 
 def create_s3_client_session():
@@ -32,54 +57,42 @@ def create_s3_client_session():
 
 def parse_customer_data(order):
     """
-    Parses customer data from an Order object into a dictionary.
+    Parses customer data from an Order object into a CustomerRow.
 
     Parameters:
     - order: An Order object containing customer data.
 
     Returns:
-    - customer_dict: A dictionary containing parsed customer data with columns:
+    - customer_row: A CustomerRow namedtuple whose fields follow the CSV columns:
         'Customer ID', 'Order Source', 'Store Name', 'Shipstation', 'Order Date', 'Order Number',
         'Amount Paid', 'Customer Name', 'Street1', 'Street2', 'City', 'State', 'Country', 'Zip',
         'Phone', 'Email'.
 
     Notes:
-    - The 'Store Name' column is currently empty and requires a function to decode store IDs into names.
+    - Store IDs missing from _STORE_MAPPING leave the 'Store Name' column empty.
     """
-    def get_store_name(storeId):
-        store_mapping = {
-            165397 : "Nuveau Amazon",
-            399784 : "Lentics Amazon",
-            399912 : "Gift Haven Amazon",
-            399729 : "3D Art Co Etsy",
-            165604 : "Nuveau Etsy"
-        }
-
-        store_name = store_mapping.get(storeId, '')
-        return store_name
-
-    customer_data = {
-        "Customer ID"  : order.Customer.id,
-        "Order Source" : order.order_source,
-        "Store Name"   : get_store_name(order.order_storeId),
-        "Shipstation"  : order.store_name,
-        "Order Date"   : order.order_date,
-        "Order Number" : order.order_number,
-        "Amount Paid"  : order.amount_paid,
-        "Customer Name": order.Customer.name,
-        "Street1"      : order.Customer.address1,
-        "Street2"      : order.Customer.address2,
-        "City"         : order.Customer.city,
-        "State"        : order.Customer.state,
-        "Country"      : order.Customer.country,
-        "Zip"          : order.Customer.postal_code,
-        "Phone"        : order.Customer.phone,
-        "Email"        : order.Customer.email
-    }
-
-    customer_data_row = customer_data
-
-    return customer_data_row
+    # Bind the nested Customer once instead of re-resolving it for every column
+    customer = order.Customer
+    customer_row = CustomerRow(
+        customer.id,
+        order.order_source,
+        _STORE_MAPPING.get(order.order_storeId, ''),
+        order.store_name,
+        order.order_date,
+        order.order_number,
+        order.amount_paid,
+        customer.name,
+        customer.address1,
+        customer.address2,
+        customer.city,
+        customer.state,
+        customer.country,
+        customer.postal_code,
+        customer.phone,
+        customer.email
+    )
+
+    return customer_row
 
 
 
@@ -105,6 +118,8 @@ def get_object_name(s3_client):
 def fetch_csv_from_s3():
     """
     Fetches a CSV file from an S3 bucket and saves it locally.
+    When the local copy from a previous invocation is still current (S3 answers 304 to the
+    conditional GET on its ETag), the download is skipped and the local copy is reused.
 
     Parameters:
     - s3_client: An instance of the boto3 S3 client.
@@ -123,10 +138,30 @@ def fetch_csv_from_s3():
     if not object_key:
         raise RuntimeError("Could Not Log Customer Data onto S3, failure to get s3_object_name")
     
+    global _LAST_ETAG, _CACHED_CSV_PATH
+
     csv_filename = object_key
     try:
         csv_path = f'/tmp/{csv_filename}'  # Local file path to save the CSV file
-        s3_client.download_file(s3_client.bucket_name, object_key, csv_path)
+
+        request_params = {"Bucket": s3_client.bucket_name, "Key": object_key}
+        if _LAST_ETAG and _CACHED_CSV_PATH == csv_path and os.path.exists(csv_path):
+            request_params["IfNoneMatch"] = _LAST_ETAG
+
+        try:
+            response = s3_client.get_object(**request_params)
+        except botocore.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("304", "NotModified"):
+                # Local copy is identical to the object in S3
+                return csv_path, s3_client
+            raise
+
+        with open(csv_path, "wb") as file:
+            for chunk in response["Body"].iter_chunks():
+                file.write(chunk)
+
+        _LAST_ETAG = response.get("ETag")
+        _CACHED_CSV_PATH = csv_path
 
         return csv_path, s3_client
     
@@ -143,11 +178,11 @@ def fetch_csv_from_s3():
 # write customer data into CSV
 def write_customer_data(csv_file_path, customer_data_log):
     """
-    Writes customer data from a list of dictionaries into a CSV file.
+    Writes customer data from a list of CustomerRow tuples into a CSV file.
 
     Parameters:
     - csv_file_path (str): The file path to the CSV file.
-    - customer_data_log (list): The list of dictionaries containing customer data to be written.
+    - customer_data_log (list): The list of CustomerRow tuples containing customer data to be written.
 
     Returns:
     - None
@@ -157,14 +192,17 @@ def write_customer_data(csv_file_path, customer_data_log):
     - PermissionError: If there are permission issues while writing to the file.
     - Exception: Catches any other unexpected exceptions.
 
-    This function appends the data from the DataFrame `customer_df` to the CSV file located at `csv_file_path`.
+    This function appends every row in `customer_data_log` to the CSV file located at `csv_file_path`
+    with a single `writerows` call, so the whole batch is serialized by the C-level csv writer.
     It uses the 'a' mode to append data without overwriting existing content.
     """
+    if not customer_data_log:
+        return None
+
     try:
         with open(csv_file_path, mode="a", newline="") as file:
-            for customer_data in customer_data_log:
-                csv_writer = csv.DictWriter(file, fieldnames=customer_data.keys())
-                csv_writer.writerow(customer_data)
+            csv_writer = csv.writer(file)
+            csv_writer.writerows(customer_data_log)
 
     except FileNotFoundError:
         print(f"Error: File '{csv_file_path}' not found.")
@@ -198,14 +236,22 @@ def upload_csv_to_s3(csv_file_path, s3_client):
     - Uses binary mode ('rb') to open the file for uploading.
     - Prints "Upload successful!" if the upload is successful.
     - Prints an error message if there is an exception during the upload process.
+    - Records the ETag of the uploaded object so the next fetch can be a conditional GET.
     """
+    global _LAST_ETAG, _CACHED_CSV_PATH
+
     object_key = os.path.basename(csv_file_path)
     try:
-        response = s3_client.put_object(
-            Body=open(csv_file_path, 'rb'),
-            Bucket=s3_client.bucket_name,
-            Key=object_key
-        )
+        with open(csv_file_path, 'rb') as file:
+            response = s3_client.put_object(
+                Body=file,
+                Bucket=s3_client.bucket_name,
+                Key=object_key
+            )
+
+        # The local file now matches the uploaded object, remember it for the next conditional GET
+        _LAST_ETAG = response.get("ETag")
+        _CACHED_CSV_PATH = csv_file_path
 
         return True
 
@@ -216,6 +262,11 @@ def upload_csv_to_s3(csv_file_path, s3_client):
 
 
 def log_customer_data(customer_data_log):
+    global _LAST_ETAG, _CACHED_CSV_PATH
+
+    # Nothing to append, skip the S3 round trip entirely
+    if not customer_data_log:
+        return True
 
     customer_data_csv_path, s3_client = fetch_csv_from_s3()
 
@@ -224,10 +275,12 @@ def log_customer_data(customer_data_log):
     successful = upload_csv_to_s3(customer_data_csv_path, s3_client)
     if successful:
         print("[+] Uploaded Customer Log to S3!")
-        # No need to keep csv in local files
-        os.remove(customer_data_csv_path)
+        # Keep the csv in /tmp, a warm container reuses it when the S3 object is unchanged
         return True
     else:
+        # Local copy diverged from S3, drop it so the next run downloads a fresh one
+        _LAST_ETAG = None
+        _CACHED_CSV_PATH = None
         os.remove(customer_data_csv_path)
         return False
 
@@ -1,26 +1,84 @@
+import copy
 import json
 import requests
 import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import NamedTuple
+from requests.adapters import HTTPAdapter
 from unicodedata import normalize
 from datetime import datetime
 from dotenv import load_dotenv
+from shipstation_automation.utils.utils import retry_with_backoff, load_cached_token, save_cached_token
 
+# Read .env once per process rather than on every token request
+load_dotenv()
 
 
-def create_fedex_session():
-    session = requests.Session()
-    access_token = get_access_token(session)
+class RateDetail(NamedTuple):
+    """The subset of a FedEx rateReplyDetails entry used to pick a rate."""
+    service_name: str
+    day_format: str          # commit.dateDetail.dayFormat, e.g. "2024-03-06T18:00:00"
+    total_net_charge: float  # ratedShipmentDetails[0].totalNetFedExCharge
 
-    if access_token:
 
-        header = {
-            'x-customer-transaction-id' : '123456123456',
-            'content-type': "application/json",
-            'x-locale': "en_US",
-            'authorization': f"Bearer {access_token}"
-            }
 
-        session.headers.update(header)
+# One keep-alive session shared by every FedEx call in this process (built lazily)
+_FEDEX_SESSION = None
+_FEDEX_SESSION_LOCK = threading.Lock()
+
+# Refresh the bearer token this many seconds before FedEx expires it
+_TOKEN_REFRESH_MARGIN = 60
+
+# Token shared between runs/processes on the same host (tokens live ~1h); /tmp is the only writable dir on Lambda
+_TOKEN_CACHE_PATH = os.path.join(tempfile.gettempdir(), '.fedex_token.json')
+
+# Rate request template, read once at import instead of once per order
+_PAYLOAD_TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fedex.json')
+with open(_PAYLOAD_TEMPLATE_PATH, 'r') as _template_file:
+    _PAYLOAD_TEMPLATE = json.load(_template_file)
+
+# Characters dropped from service names: anything outside ASCII (e.g. '®'), plus '.' for ShipStation keys
+_NON_ASCII = re.compile(r'[^\x00-\x7f]')
+_NON_ASCII_OR_DOT = re.compile(r'[^\x00-\x7f]|\.')
+
+# FedEx API service name -> ShipStation service name, keyed by (is_residential, FedEx name).
+# FedEx quotes 'Ground' for homes and 'Home Delivery' for businesses the other way round from ShipStation.
+_REWRITE = {
+    (True, "FedEx Ground®")        : "FedEx Home Delivery®",
+    (False, "FedEx Home Delivery®"): "FedEx Ground®"
+}
+
+# SmartPost is split by weight on ShipStation (under 16oz is 'lightweight')
+_SMART_POST_SERVICE = 'FedEx SmartPost®'
+_SMART_POST_WEIGHT_LIMIT = 16
+
+# Upper bound on in-flight rate quotes when fetching a batch of orders.
+# Also the size of the connection pool, so every in-flight quote has a warm connection.
+_MAX_CONCURRENT_QUOTES = 8
+
+
+
+def create_fedex_session():
+    session = requests.Session()
+    # Every call goes to apis.fedex.com: one host pool, sized to the quote concurrency and
+    # blocking when full so threads wait for a warm connection instead of opening (and then
+    # discarding) extra TLS connections
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=_MAX_CONCURRENT_QUOTES, pool_block=True))
+
+    header = {
+        'x-customer-transaction-id' : '123456123456',
+        'content-type': "application/json",
+        'x-locale': "en_US"
+        }
+    session.headers.update(header)
+    session.token_expires_at = 0.0
+
+    if refresh_access_token(session):
         return session
 
     else:
@@ -29,9 +87,48 @@ def create_fedex_session():
 
 
 
+def refresh_access_token(session):
+    """
+    Requests a new bearer token and stores it on the session along with its expiry
+    (as a time.monotonic() timestamp). Returns True on success, False otherwise.
+    """
+    access_token, expires_in = get_access_token(session)
+    if not access_token:
+        return False
+
+    session.headers['authorization'] = f"Bearer {access_token}"
+    session.token_expires_at = time.monotonic() + expires_in
+    return True
+
+
+
+def get_fedex_session():
+    """
+    Returns the process-wide FedEx session, creating it on first use and refreshing
+    the bearer token shortly before it expires. Returns None if no token could be obtained.
+    """
+    global _FEDEX_SESSION
+
+    with _FEDEX_SESSION_LOCK:
+        if _FEDEX_SESSION is None:
+            _FEDEX_SESSION = create_fedex_session()
+
+        elif time.monotonic() >= _FEDEX_SESSION.token_expires_at - _TOKEN_REFRESH_MARGIN:
+            if not refresh_access_token(_FEDEX_SESSION):
+                print("[X] Failed to refresh Fedex Access Token")
+
+        return _FEDEX_SESSION
+
+
+
+@lru_cache(maxsize=1)
 def get_api_keys():
+    """
+    Returns the FedEx (client_id, client_secret), read from the environment once.
 
-    load_dotenv()
+    Read lazily on first use rather than at import: app.py loads the credentials from
+    Secrets Manager into os.environ after this module has been imported.
+    """
     #test keys
     # client_id = 'l7c51ccd965a6d4295acd02cc078d16e72'
     # client_secret = 'd2d0280a3d044f978a9350a917911ea6'
@@ -51,7 +148,8 @@ def get_access_token(session):
     to obtain an access token using client credentials flow.
 
     Returns:
-    - str or None: The access token if retrieved successfully, else None.
+    - tuple: (access_token, expires_in) where expires_in is the token lifetime in seconds,
+    or (None, 0) if the token could not be retrieved.
 
     Raises:
     - requests.HTTPError: If the request to the FedEx API fails.
@@ -59,8 +157,13 @@ def get_access_token(session):
 
     Note:
     The function uses the client ID and client secret obtained from the
-    `get_api_keys` function to authenticate the request.
+    `get_api_keys` function to authenticate the request. A still-valid token from
+    the on-disk cache is returned without contacting FedEx, and new tokens are cached.
     """
+    access_token, expires_at = load_cached_token(_TOKEN_CACHE_PATH, _TOKEN_REFRESH_MARGIN)
+    if access_token:
+        return access_token, expires_at - time.time()
+
     # API token URL sandbox
     #url = "https://apis-sandbox.fedex.com/oauth/token"
 
@@ -76,20 +179,31 @@ def get_access_token(session):
     headers = {
         'Content-Type': "application/x-www-form-urlencoded"
         }
-    try:
+
+    def request_token():
         response = session.post(url, data=payload, headers=headers, timeout=10)
-        response.raise_for_status() # raises error if not 200 status
+        if response.status_code != 200:
+            response.raise_for_status() # raises error on 4xx/5xx
+        return response
+
+    try:
+        response = retry_with_backoff(request_token, label="Fedex request")
 
-        access_token = response.json()["access_token"]
+        token_data = json.loads(response.content)
+        access_token = token_data["access_token"]
+        expires_in = int(token_data.get("expires_in", 3599))
         print("[+] Fedex 0Auth token request successful!")
+
+        save_cached_token(_TOKEN_CACHE_PATH, access_token, time.time() + expires_in)
     
     except Exception as e:
         print("[X] Could not retrieve fedex access_token")
         print(f"Error: {e}")
         access_token = None
+        expires_in = 0
 
 
-    return access_token
+    return access_token, expires_in
 
 
 
@@ -97,9 +211,9 @@ def set_payload(order):
     """
     Set the payload for a FedEx shipment request based on order details.
 
-    This function reads a JSON file containing a FedEx shipment request payload template.
-    It updates specific fields in the payload based on the provided `orderObject` and
-    returns the updated payload.
+    This function copies the FedEx shipment request payload template (loaded once from
+    fedex.json at import). It updates specific fields in the payload based on the provided
+    `orderObject` and returns the updated payload.
 
     Args:
     - orderObject: An object containing order details such as shipping information.
@@ -108,26 +222,21 @@ def set_payload(order):
     - dict: The updated FedEx shipment request payload.
 
     Notes:
-    The function reads the JSON file specified by `json_file` and modifies specific fields
-    in the payload template based on the provided `orderObject`. It updates recipient address
-    details, shipment date, package weight, and package dimensions.
+    The function deep copies `_PAYLOAD_TEMPLATE` so the shared template is never mutated,
+    then fills in recipient address details, shipment date and package weight.
     """
-    #location of fedex json payload template
-    json_file = './fedex.json'
+    payload = copy.deepcopy(_PAYLOAD_TEMPLATE)
 
-    with open(json_file, 'r') as file:
-        payload = json.load(file)
+    payload["requestedShipment"]["shipper"]["address"]["postalCode"] = order.Shipment.from_postal_code
+    payload["requestedShipment"]["shipper"]["address"]["stateOrProvinceCode"] = order.Shipment.from_state
+    payload["requestedShipment"]["shipper"]["address"]["countryCode"] = order.Shipment.from_country
 
-        payload["requestedShipment"]["shipper"]["address"]["postalCode"] = order.Shipment.from_postal_code
-        payload["requestedShipment"]["shipper"]["address"]["stateOrProvinceCode"] = order.Shipment.from_state
-        payload["requestedShipment"]["shipper"]["address"]["countryCode"] = order.Shipment.from_country
-
-        payload["requestedShipment"]["recipient"]["address"]["postalCode"] =  order.Customer.postal_code[:5]
-        payload["requestedShipment"]["recipient"]["address"]["stateOrProvinceCode"] =  order.Customer.state
-        payload["requestedShipment"]["recipient"]["address"]["countryCode"] = order.Customer.country
-        
-        payload["requestedShipment"]["shipDateStamp"] = order.ship_date  #YYYY-MM-DD
-        payload["requestedShipment"]["requestedPackageLineItems"][0]["weight"]["value"] = float(order.Shipment.weight['value'] / 16) #convert ounce to pounds
+    payload["requestedShipment"]["recipient"]["address"]["postalCode"] =  order.Customer.postal_code[:5]
+    payload["requestedShipment"]["recipient"]["address"]["stateOrProvinceCode"] =  order.Customer.state
+    payload["requestedShipment"]["recipient"]["address"]["countryCode"] = order.Customer.country
+    
+    payload["requestedShipment"]["shipDateStamp"] = order.ship_date  #YYYY-MM-DD
+    payload["requestedShipment"]["requestedPackageLineItems"][0]["weight"]["value"] = float(order.Shipment.weight['value'] / 16) #convert ounce to pounds
 
     return payload
 
@@ -136,14 +245,7 @@ def temp_payload():
     """
     For Testing: to resolve payload issues
     """
-    json_file = './fedex.json'
-
-    #initiate payload
-    #payload = set_payload(order_object, json_file)
-    with open(json_file, 'r') as file:
-        payload = json.load(file)
-
-        return payload
+    return copy.deepcopy(_PAYLOAD_TEMPLATE)
 
 
 
@@ -152,25 +254,39 @@ def get_fedex_response(order):
     Retrieve FedEx shipping rates for an order from the FedEx API.
 
     This function sends a POST request to the FedEx rate quotes endpoint
-    to obtain shipping rate information based on the provided `order_object`
-    and `access_token`.
+    to obtain shipping rate information based on the provided `order_object`.
 
     Args:
     - order_object: An object containing details of the order to be shipped.
-    - access_token (str): An access token obtained from the FedEx OAuth2.0 API.
 
     Returns:
-    - dict or None: A dictionary containing shipping rate information if
-    retrieved successfully, else None.
+    - list or None: One RateDetail per rated service if retrieved successfully, else None.
 
     Raises:
     - requests.HTTPError: If the request to the FedEx API fails.
     - Exception: If any other error occurs during the request.
 
     Notes:
-    The function uses the access token provided to authenticate the request.
+    The request goes through the shared session from `get_fedex_session`, so the
+    TLS connection and bearer token are reused across orders.
     It sends a POST request with the order details in JSON format and
-    retrieves the shipping rate information in JSON format.
+    keeps only the three fields used downstream from the (large, nested) JSON reply.
+    """
+
+    # Initiate payload
+    # Compact separators: no whitespace to build or send
+    payload = json.dumps(set_payload(order), separators=(",", ":"))
+    #payload = json.dumps(temp_payload())
+
+    return post_rate_request(payload)
+
+
+
+def post_rate_request(payload):
+    """
+    POSTs an already serialized rate request and returns its RateDetails (see `get_fedex_response`).
+    Returns an empty list when FedEx rejects the request (4xx other than 429, not retried),
+    or None when the request fails otherwise.
     """
 
     #sandbox URL
@@ -179,26 +295,72 @@ def get_fedex_response(order):
     #production URL
     url = "https://apis.fedex.com/rate/v1/rates/quotes"
 
-    # Initiate payload
-    payload = json.dumps(set_payload(order))
-    #payload = json.dumps(temp_payload())
+    session = get_fedex_session()
+    if session is None:
+        return None
 
-    try:
-        response = order.fedex_client.post(url, data=payload, timeout=10)
+    def request_rates():
+        response = session.post(url, data=payload, timeout=10)
+        if response.status_code != 200:
+            response.raise_for_status() # raises error on 4xx/5xx
+        return response
 
-        response.raise_for_status()
-        response_json = response.json()
+    try:
+        response = retry_with_backoff(request_rates, label="Fedex request")
+        rate_details = _project_rate_details(json.loads(response.content))
+
+    except requests.exceptions.HTTPError as e:
+        status_code = e.response.status_code if e.response is not None else None
+        if status_code is not None and 400 <= status_code < 500 and status_code != 429:
+            # Deterministic rejection (bad address, postal code, weight...): FedEx's body has the field-level
+            # errors. Return no options rather than None so callers don't fetch the same request again.
+            print(f"[X] Fedex rejected rate request ({status_code}): {e.response.text}")
+            rate_details = []
+        else:
+            print("[X] Could not retrieve fedex response")
+            print(f"Error: {e}")
+            rate_details = None
 
     except Exception as e:
         print("[X] Could not retrieve fedex response")
         print(f"Error: {e}")
-        response_json = None
+        rate_details = None
+
+    return rate_details
+
+
+
+def _project_rate_details(response_json):
+    """
+    Reduces a FedEx rate reply to RateDetail tuples so the rest of the parsed reply
+    (surcharges, rate breakdowns, ...) can be freed right away.
+    """
+    return [
+        RateDetail(
+            rate_detail["serviceName"],
+            rate_detail["commit"]["dateDetail"]["dayFormat"],
+            rate_detail["ratedShipmentDetails"][0]["totalNetFedExCharge"]
+        )
+        for rate_detail in response_json["output"]["rateReplyDetails"]
+    ]
 
-    return response_json
 
 
 
 
+@lru_cache(maxsize=512)
+def _clean_service_name(service_name, strip_dots=False):
+    """
+    Strips special characters (e.g. '®') from a service name, optionally dropping '.' as well.
+    FedEx and ShipStation return the same handful of names for every order, so results are cached.
+    """
+    pattern = _NON_ASCII_OR_DOT if strip_dots else _NON_ASCII
+    if service_name.isascii():
+        # Most names only need the dots handled, no decomposition required
+        return pattern.sub('', service_name) if strip_dots else service_name
+    return pattern.sub('', normalize('NFKD', service_name))
+
+
 
 def update_prices(order, shipping_options: dict):
     """
@@ -207,7 +369,7 @@ def update_prices(order, shipping_options: dict):
     Parameters:
     - order: The order object containing rate information.
     - shipping_options (dict): A dictionary representing shipping options, where each option is a dictionary
-    with keys 'service_name', 'delivery_date', and 'price'.
+    with keys 'service_name', 'service_name_key', 'delivery_date', and 'price'.
 
     Returns:
     - dict: An updated dictionary of shipping options with updated prices based on Shipstation rates.
@@ -219,7 +381,7 @@ def update_prices(order, shipping_options: dict):
 
     # Get Shipstation Rates --> convert to dict  --> clean unwanted symbols
     ss_rates_dict = {
-        normalize('NFKD', key).encode('ascii', 'ignore').decode('utf-8').replace(".", ""): value
+        _clean_service_name(key, strip_dots=True): value
         for key, value in order.rates['fedex']
     }
     # print(f"SS_Rates simple --> {ss_rates_dict}\n")
@@ -230,9 +392,9 @@ def update_prices(order, shipping_options: dict):
     options_after_price_update = []
     for option in shipping_options:
 
-        service_name = normalize('NFKD', option['service_name']).encode('ascii', 'ignore').decode('utf-8') #gets rid of special characters in names
-        if service_name in ss_rates_dict:
-            option['price'] = ss_rates_dict[service_name]
+        service_name_key = option['service_name_key'] # cleaned once in get_delivery_dates
+        if service_name_key in ss_rates_dict:
+            option['price'] = ss_rates_dict[service_name_key]
             options_after_price_update.append(option)
 
     return options_after_price_update
@@ -240,7 +402,7 @@ def update_prices(order, shipping_options: dict):
 
 
 
-def get_delivery_dates(order):
+def get_delivery_dates(order, rate_details=None):
     """
     Retrieve delivery dates and shipping rates for an order from the FedEx API.
 
@@ -252,6 +414,8 @@ def get_delivery_dates(order):
 
     Args:
     - order_object: An object containing details of the order to be shipped.
+    - rate_details (list, optional): RateDetails already fetched for this order
+    (see `get_fedex_best_rates`). Fetched here when not provided.
 
     Returns:
     - list of dict: A list of dictionaries representing optional shipping services.
@@ -260,36 +424,38 @@ def get_delivery_dates(order):
     Notes:
     The function utilizes the `get_access_token` and `get_fedex_response` functions
     to authenticate with the FedEx API and retrieve shipping rate information.
-    It processes the response JSON to extract shipping options and returns them
+    It processes the RateDetails to extract shipping options and returns them
     as a list of dictionaries.
     """
-    response_json = get_fedex_response(order)
+    if rate_details is None:
+        rate_details = get_fedex_response(order)
+    if not rate_details:
+        return []
+
+    # Same for every option of this order
+    is_residential = bool(order.Customer.is_residential)
+    if order.Shipment.weight['value'] < _SMART_POST_WEIGHT_LIMIT:
+        smart_post_name = 'FedEx SmartPost parcel select lightweight'
+    else:
+        smart_post_name = 'FedEx SmartPost parcel select'
 
-    # List of dictionaries representing the shipping options
-    raw_shipping_options = response_json["output"]["rateReplyDetails"]
     clean_shipping_options = []
 
-    for shipping_service in raw_shipping_options:
+    for rate_detail in rate_details:
+        service_name = rate_detail.service_name
         # Create object to store data for shipping option
         shipping_option = {}
         
-        # Determine the service name based on conditions
-        if shipping_service["serviceName"] == 'FedEx SmartPost®':
-            if order.Shipment.weight['value'] < 16:
-                shipping_option["service_name"] = 'FedEx SmartPost parcel select lightweight'
-            else:
-                shipping_option["service_name"] = 'FedEx SmartPost parcel select'
-        # Adjusts service names between Fedex API ('Fedex Ground') and Shipstation API ('FedEx Home Delivery') based on the order's residential status
-        elif order.Customer.is_residential and shipping_service["serviceName"] == "FedEx Ground®":
-            shipping_option["service_name"] = "FedEx Home Delivery®"
-        elif not order.Customer.is_residential and shipping_service["serviceName"] == "FedEx Home Delivery®":
-            shipping_option["service_name"] = "FedEx Ground®"
+        # Map the FedEx API name onto the name ShipStation uses for the same service
+        if service_name == _SMART_POST_SERVICE:
+            shipping_option["service_name"] = smart_post_name
         else:
-            shipping_option["service_name"] = shipping_service["serviceName"]
+            shipping_option["service_name"] = _REWRITE.get((is_residential, service_name), service_name)
 
         # Add common data for all service names
-        shipping_option["delivery_date"] = shipping_service["commit"]["dateDetail"]["dayFormat"]
-        shipping_option["price"] = shipping_service["ratedShipmentDetails"][0]["totalNetFedExCharge"]
+        shipping_option["service_name_key"] = _clean_service_name(shipping_option["service_name"]) # gets rid of special characters, used to match ShipStation rates
+        shipping_option["delivery_date"] = rate_detail.day_format
+        shipping_option["price"] = rate_detail.total_net_charge
         
         clean_shipping_options.append(shipping_option)
 
@@ -311,11 +477,11 @@ def get_smart_post_delivery_date(shipping_options):
     """
     Saves Smart Post Delivery Date to order object. Info will be uploaded to Shipstation front end later.
     """
-    for option in shipping_options:
-        if option['service_name'] == 'FedEx SmartPost parcel select' or option['service_name'] == 'FedEx SmartPost parcel select lightweight':
-            smart_post_delivery_date = option['delivery_date'][:10]
-        else:
-            smart_post_delivery_date = "None Provided"
+    # First SmartPost option wins ('FedEx SmartPost parcel select' or its 'lightweight' variant)
+    smart_post_delivery_date = next(
+        (option['delivery_date'][:10] for option in shipping_options if option['service_name'].startswith('FedEx SmartPost parcel select')),
+        "None Provided"
+    )
 
     smart_post_message = f"SmartPost D-Date: {smart_post_delivery_date}"
     return smart_post_message
@@ -323,7 +489,25 @@ def get_smart_post_delivery_date(shipping_options):
 
 
 
-def filter_valid_shipping_options(order, shipping_options):
+def get_deliver_by_date(order):
+    """
+    Parses `order.deliver_by_date` ("%m/%d/%Y %H:%M:%S") into a datetime.
+
+    Returns None when the date is unparseable or already in the past: no FedEx service can
+    meet it, so the rate request can be skipped altogether.
+    """
+    try:
+        deliver_by_date = datetime.strptime(order.deliver_by_date, "%m/%d/%Y %H:%M:%S")
+    except (TypeError, ValueError):
+        return None
+
+    if deliver_by_date < datetime.now():
+        return None
+    return deliver_by_date
+
+
+
+def filter_valid_shipping_options(order, shipping_options, deliver_by_date=None):
     """
     Filters shipping options to include only those that will arrive on or before the latest delivery date, 
     and updates the delivery date value to a datetime object.
@@ -333,15 +517,20 @@ def filter_valid_shipping_options(order, shipping_options):
                         - `deliver_by_date` (datetime): The latest delivery date for the order.
         shipping_options (list): A list of dictionaries representing the shipping options, where each dictionary 
                                 must include a 'delivery_date' key with a value in the format "%Y-%m-%dT%H:%M:%S".
+        deliver_by_date (datetime, optional): `order.deliver_by_date` already parsed by the caller.
 
     Returns:
         list: A list of dictionaries containing the valid shipping options, with the 'delivery_date' values 
             converted to datetime objects.
     """
+    # Same for every option, parse once
+    if deliver_by_date is None:
+        deliver_by_date = datetime.strptime(order.deliver_by_date, "%m/%d/%Y %H:%M:%S")
+
     valid_shipping_options = []
     for option in shipping_options:
-        delivery_date = datetime.strptime(option['delivery_date'], "%Y-%m-%dT%H:%M:%S")
-        deliver_by_date = datetime.strptime(order.deliver_by_date, "%m/%d/%Y %H:%M:%S")
+        # ISO 8601 ("%Y-%m-%dT%H:%M:%S"), fromisoformat is a C fast path unlike strptime
+        delivery_date = datetime.fromisoformat(option['delivery_date'])
 
         if delivery_date <= deliver_by_date:
             # Update value with the datetime object instead of str
@@ -355,7 +544,7 @@ def filter_valid_shipping_options(order, shipping_options):
 
 
 
-def get_fedex_best_rate(order):
+def get_fedex_best_rate(order, rate_details=None):
     """
     Get the best FedEx shipping rate based on the latest delivery date.
 
@@ -366,7 +555,7 @@ def get_fedex_best_rate(order):
 
     Args:
     - order_object: An object containing details of the order to be shipped.
-    - latest_deliver_date (str): The latest acceptable delivery date in 'YYYY-MM-DDTHH:MM:SS' format.
+    - rate_details (list, optional): RateDetails already fetched for this order.
 
     Returns:
     - dict: A dictionary representing the best shipping option with keys 'service_type', 'delivery_date', and 'price'.
@@ -381,9 +570,14 @@ def get_fedex_best_rate(order):
     rate_is_applicable = order.rates.get("fedex", False)
     if not rate_is_applicable:
         return None
+
+    # A deliver-by date that is unparseable or already past can't be met, skip the FedEx request
+    deliver_by_date = get_deliver_by_date(order)
+    if deliver_by_date is None:
+        return None
     
     # Get all shipping options
-    shipping_options =  get_delivery_dates(order)
+    shipping_options =  get_delivery_dates(order, rate_details)
 
     # Writing Smartpost Delivery date to object to be updated onto a field in Shipstation Front End
     smart_post_message = get_smart_post_delivery_date(shipping_options)
@@ -391,15 +585,16 @@ def get_fedex_best_rate(order):
 
 
     # List of options that will arrive on time
-    valid_shipping_options = filter_valid_shipping_options(order, shipping_options)
+    valid_shipping_options = filter_valid_shipping_options(order, shipping_options, deliver_by_date)
 
     # Find the best shipping option based on buisness logic
     if valid_shipping_options:
-        sorted_options = sorted(valid_shipping_options, key=lambda x: x['price'])
-        #print(f"sorted options = {sorted_options}")
+        cheapest_option = min(valid_shipping_options, key=lambda x: x['price'])
         # Desired business logic. Willing to ship up to $0.35 more expensive if package arrives earlier than the cheapest shipping rate
-        better_options = [option for option in sorted_options if option['price'] - sorted_options[0]['price'] < 0.35 and option['delivery_date'] < sorted_options[0]['delivery_date']]
-        best_option = min(better_options, key=lambda x: x['delivery_date']) if better_options else sorted_options[0]
+        best_option = cheapest_option
+        for option in valid_shipping_options:
+            if option['price'] - cheapest_option['price'] < 0.35 and option['delivery_date'] < best_option['delivery_date']:
+                best_option = option
         best_option_dict = {
             "carrierCode": "fedex",
             "serviceCode": best_option["service_name"],
@@ -410,6 +605,40 @@ def get_fedex_best_rate(order):
     else:
         return None
 
+
+
+def get_fedex_best_rates(orders, max_workers=_MAX_CONCURRENT_QUOTES):
+    """
+    Get the best FedEx shipping rate for a batch of orders.
+
+    The rate-quote requests are network bound, so they are sent concurrently over the
+    shared FedEx session (at most `max_workers` in flight). Orders with an identical request
+    (same origin, destination, ship date and weight) share a single quote. The selection
+    logic in `get_fedex_best_rate` then runs sequentially on the fetched responses.
+
+    Args:
+    - orders (list): Order objects to quote.
+    - max_workers (int): Maximum number of concurrent rate requests.
+
+    Returns:
+    - list: The best rate dict (or None) for each order, in the same order as `orders`.
+    """
+    applicable_orders = [order for order in orders if order.rates.get("fedex", False) and get_deliver_by_date(order)]
+
+    # Serialized request per order; repeated payloads are only sent once
+    payloads = {id(order): json.dumps(set_payload(order), separators=(",", ":")) for order in applicable_orders}
+    unique_payloads = list(dict.fromkeys(payloads.values()))
+
+    rate_details_by_payload = {}
+    if unique_payloads:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            rate_details_by_payload = dict(zip(unique_payloads, executor.map(post_rate_request, unique_payloads)))
+
+    return [
+        get_fedex_best_rate(order, rate_details_by_payload.get(payloads.get(id(order))))
+        for order in orders
+    ]
+
     
 
 if __name__ == '__main__':
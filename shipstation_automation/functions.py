@@ -1,10 +1,13 @@
 from dotenv import load_dotenv
-import json, os, time, requests
-from shipstation_automation.integrations.shipstation.v1.api import *
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import json, os, re, tempfile, threading, requests
+from collections import deque
+from operator import itemgetter
+from shipstation_automation.integrations.shipstation.v1.api import ShipStation
 from shipstation_automation.classes import Order
 from shipstation_automation.integrations.ups.ups_api import UPSAPIClient
 from shipstation_automation.services.ups_service import UPSService
-from shipstation_automation.fedex_api import create_fedex_session
+from shipstation_automation.fedex_api import get_fedex_session
 from shipstation_automation.customer_log import create_s3_client_session
 from shipstation_automation.utils.output_manager import OutputManager
 
@@ -13,6 +16,197 @@ output = OutputManager(__name__)
 __author__ = ["Bobby Veith"]
 __company__ = "Lentics, Inc."
 
+# Max concurrent ShipStation requests when refreshing/fetching (the client's response hook handles rate limiting)
+_MAX_SHIPSTATION_WORKERS = 8
+# Largest page ShipStation allows on /orders/list (its default is 100)
+_ORDERS_PAGE_SIZE = 500
+
+# Tags queued by queue_tag(), sent together by flush_tags()
+_TAG_QUEUE = []
+_TAG_QUEUE_LOCK = threading.Lock()
+_MAX_TAG_WORKERS = 16
+
+# Fields of a /shipments/getrates payload that are the same for every order and carrier
+_RATES_PAYLOAD_TEMPLATE = {
+    "serviceCode": None,
+    "packageCode": "package"
+}
+
+# SS_account -> carrierCode -> shipping provider id billed when the order is updated
+_SHIPPING_PROVIDER_IDS = {
+    "nuveau" : {
+        "stamps_com"    : 139051,
+        "ups"           : 659748,
+        "fedex"         : 203639,
+        "ups_walleted"  : 139292
+    },
+    "lentics" : {
+        "stamps_com"    : 89042,
+        "ups"           : 1227452,
+        "fedex"         : 465570,
+        "ups_walleted"  : 465647
+    }
+}
+
+# "PO Box", "P.O. Box", "p o box"... in any case
+_PO_BOX_PATTERN = re.compile(r"\bp\.?\s*o\.?\s*box\b", re.IGNORECASE)
+
+# Sort key of a carrier's best rate dict
+_BY_PRICE = itemgetter("price")
+
+# Max orders ShipStation accepts in one /orders/createorders request
+_CREATE_ORDERS_BATCH_SIZE = 100
+
+# Orders whose sku starts with one of these are put on hold by hold_order
+_HOLD_SKU_PREFIXES = ("F3", "T3", "O4", "F2BFpM")
+
+# Max orders initiated concurrently in decode_response
+_MAX_ORDER_WORKERS = 16
+
+# Carriers quoted by get_rates_for_all_carriers, one concurrent /shipments/getrates request each
+_RATE_CARRIERS = ("ups", "fedex", "ups_walleted", "stamps_com")
+# Stallion does not ship FedEx (see get_champion_rate), so its orders are never quoted FedEx
+_STALLION_RATE_CARRIERS = tuple(carrier for carrier in _RATE_CARRIERS if carrier != "fedex")
+
+# Raw order dicts that failed to decode, kept for post-mortem and written once per run to _FAILED_ORDERS_PATH
+_FAILED_ORDERS = deque(maxlen=32)
+_FAILED_ORDERS_PATH = os.path.join(tempfile.gettempdir(), 'failed_orders.json')
+
+# Manually created orders, never processed
+_BAD_STORES = frozenset({165349, 203468, 325291, 433937})
+# Pop Creations orders, never processed
+_POP_WAREHOUSE_ID = 779978
+
+# ======== TAG IDS =============================
+# Tags are created on each ShipStation account's front end.
+# Keys are shipstation accounts and secondary keys are tag_reasons
+_TAG_IDS = {
+    "nuveau": {
+        "Multi-Order"           : 52943,
+        "No-Dims"               : 52944,
+        "Ready"                 : 52987,
+        "No-DeliveryDate"       : 52992,
+        "No API Keys"           : 53068,
+        "No SS Carrier Rates"   : 53339,
+        "No UPS Rate"           : 53341,
+        "No USPS Rate"          : 53342,
+        "No Fedex Rate"         : 53343,
+        "Shipping not set"      : 53344,
+        "Double-Order"          : 53526
+    },
+    "lentics": {
+        "Multi-Order"           : 166210,
+        "No-Dims"               : 166211,
+        "Ready"                 : 166212,
+        "No-DeliveryDate"       : 166703,
+        "No API Keys"           : 166471,
+        "No SS Carrier Rates"   : 166704,
+        "No UPS Rate"           : 166702,
+        "No USPS Rate"          : 166701,
+        "No Fedex Rate"         : 166700,
+        "Shipping not set"      : 166699,
+        "Double-Order"          : 166945,
+    }
+}
+# ================================================
+
+# ======== SHIP FROM LOCATIONS =================
+_MICHIGAN_WAREHOUSE_IDS = frozenset({486100, 98792, 1097041, 505774, 857645, 1097039})
+_STALLION_WAREHOUSE_IDS = frozenset({1097040, 665600})
+
+_MICHIGAN_SHIP_FROM = {
+    "from_postal_code": "49022",
+    "from_city": "Benton Harbor",
+    "from_state": "MI",
+    "from_country": "US",
+    "from_address": "3329 Territorial Rd",
+    "from_name": "Shipping Department"
+}
+
+_STALLION_SHIP_FROM = {
+    "from_postal_code": "46203",
+    "from_city": "Indianapolis",
+    "from_state": "IN",
+    "from_country": "US",
+    "from_address": "1435 E Naomi St",
+    "from_name": "Shipping Department"
+}
+
+# warehouseId -> ship from attributes for order.Shipment
+_SHIPFROM_BY_WAREHOUSE = {
+    **{warehouse_id: _MICHIGAN_SHIP_FROM for warehouse_id in _MICHIGAN_WAREHOUSE_IDS},
+    **{warehouse_id: _STALLION_SHIP_FROM for warehouse_id in _STALLION_WAREHOUSE_IDS}
+}
+# ================================================
+
+# ======== MULTI-ORDER BOX SIZES =================
+# Weight & dimensions info for Stallion products, keyed by the size code in the warehouse location
+_STALLION_MAPPING = {
+    "1218" : {"L" : 16, "W": 20, "H": 2.0, "Ounces": 80},
+    "1620" : {"L" : 19, "W": 25, "H": 2.0, "Ounces": 96},
+    "1236" : {"L" : 20, "W": 35, "H": 2.0, "Ounces": 128},
+    "1823" : {"L" : 19, "W": 25, "H": 2.0, "Ounces": 96},
+    "1824" : {"L" : 19, "W": 25, "H": 2.0, "Ounces": 96},
+    "2024" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
+    "2026" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
+    "2228" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
+    "2325" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
+    "2329" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
+    "2335" : {"L" : 26, "W": 38, "H": 2.0, "Ounces": 128},
+    "2430" : {"L" : 26, "W": 28, "H": 2.0, "Ounces": 128},
+    "2435" : {"L" : 26, "W": 28, "H": 2.0, "Ounces": 128},
+    "2436" : {"L" : 26, "W": 28, "H": 2.0, "Ounces": 128},
+    "2638" : {"L" : 41, "W": 29, "H": 2.0, "Ounces": 128},
+    "2739" : {"L" : 41, "W": 29, "H": 2.0, "Ounces": 128},
+    "2839" : {"L" : 41, "W": 29, "H": 2.0, "Ounces": 128},
+    "2531" : {"L" : 26, "W": 28, "H": 2.0, "Ounces": 128},
+    "0810" : {"L" : 13, "W": 13, "H": 1.0, "Ounces": 32},
+}
+
+# Weight & dimensions info for Lentics products
+_LENTICS_MAPPING = {
+    "F1" : {"L" : 20, "W": 16, "H": 1.5, "Ounces": 32},
+    "P1" : {"L" : 13, "W": 18, "H": 0.1, "Ounces": 8},
+    "P3" : {"L" : 17, "W": 17, "H": 0.1, "Ounces": 8},
+    "F2" : {"L" : 28, "W": 24, "H": 2.0, "Ounces": 96},
+    "O2" : {"L" : 19, "W": 19, "H": 1.5, "Ounces": 38}
+}
+
+_BILLY_BASS_SKUS = frozenset({
+    'M-BBass 2', 'Billy Bass 02', 'Gemmy01', 'Gemmy03', 'Gemmy Big Mouth Billy Bass 3',
+    'Gemmy BBass3', 'M-BBass', 'Billy Bass Original', 'L-BBass1', 'L-BBass2', 'L-BBass3'
+})
+
+_FRESH_STOOL_SKUS = frozenset({
+    'Gel Replacment 8 Pack', 'FS-Black', 'FS- White + 4 Gels', 'FS- White', 'FS- Pink', 'FS- Gray',
+    'FS- Blue', 'FS- Black', 'FS - White', 'FS - Pink + 4 Gels', 'FS - Pink', 'FS - Gray + 4 Gels',
+    'FS - Gray', 'FS - Blue + 4 Gels', 'FS - Blue', 'FS - Black'
+})
+
+# Nuveau SKU prefix -> (Length/in, Width/in, Height/in, Weight/oz)
+_DIMENSIONS_TO_SKU_MAPPING = {
+    'P1': (13, 18, 0.1, 8),
+    'P2': (13, 18, 0.1, 8),
+    'F1': (22, 15, 1.5, 40),
+    'T1': (22, 16.5, 1.5, 50),
+    'F2': (28, 22, 1.5, 80),
+    'T2': (28, 22, 1.5, 80),
+    'F3': (41, 29, 2.0, 176),
+    'T3': (41, 29, 2.0, 192),
+    'O2': (21, 20, 1.5, 48),
+    'O3': (28, 27, 1.5, 96),
+    'O4': (21, 29, 1.5, 136),
+    'BB': (12.5, 8.5, 4.5, 32),
+    'FS': (15.75, 8.75, 3.25, 32)
+}
+# ================================================
+
+
+def _dumps(payload):
+    """Serializes a request body compactly, without the spaces json.dumps puts after separators."""
+    return json.dumps(payload, separators=(",", ":"))
+
+
 
 def get_store_ids(name_of_store):
     '''
@@ -53,6 +247,62 @@ def get_store_ids(name_of_store):
 
 
 
+def _refresh_store(shipstation, store_name, store_id):
+    """
+    Refreshes a single store so ShipStation imports its newest orders.
+
+    Connection errors are retried by the ShipStation client's session; the refresh POST itself is sent once.
+
+    Return:
+        bool: True if the store was refreshed, False on an HTTP error.
+    Raises:
+        RuntimeError: ShipStation answered 200 but reported the refresh as unsuccessful.
+    """
+    output.print_section_item(f"[+] Refreshing store: {store_name}", color="green")
+    output.print_section_item(f"[+] Shipstation: {shipstation}", color="green")
+
+    try:
+        response = shipstation.post(endpoint=f"/stores/refreshstore?storeId={store_id}")
+        response.raise_for_status()
+    except requests.exceptions.HTTPError as e:
+        print(f"[X] Error: Unable to refresh store {store_name}")
+        print(e.response.status_code)
+        print(e)
+        return False
+
+    response_json = response.json()
+    output.print_section_item(f"[+] Response: {response_json}", color="green")
+    if response_json["success"] != 'true':
+        raise RuntimeError(f"200 Code but not able to refresh {store_name}")
+    return True
+
+
+
+def _fetch_awaiting(shipstation, page=1):
+    """
+    Fetches one page of the account-wide awaiting_shipment orders. Transient failures are retried by the client's session.
+    Orders of every store are returned, decode_response drops the ones from _BAD_STORES.
+    """
+    parameters = {
+        'order_status': 'awaiting_shipment',
+        'page': page,
+        'page_size': _ORDERS_PAGE_SIZE
+    }
+
+    response = shipstation.fetch_orders(parameters=parameters)
+    response.raise_for_status()
+    return response
+
+
+
+def _refresh_all(store_refreshes, executor):
+    """Runs every (shipstation, store_name, store_id) refresh on `executor` and waits for all of them."""
+    futures = [executor.submit(_refresh_store, *store_refresh) for store_refresh in store_refreshes]
+    for future in as_completed(futures):
+        future.result()
+
+
+
 def refresh_stores(name_of_store, shipstation):
     """
     Refreshes all active stores on the shipstation account to ensure all new orders are loaded on Shipstations end.
@@ -64,26 +314,11 @@ def refresh_stores(name_of_store, shipstation):
     
     """
     dict_of_store_ids = get_store_ids(name_of_store) # Can pass shipstation client instead to get newly generated list of store_ids
+    store_refreshes = [(shipstation, store_name, store_id) for store_name, store_id in dict_of_store_ids.items()]
 
-    for store_name, store_id in dict_of_store_ids.items():
-        try:
-            output.print_section_item(f"[+] Refreshing store: {store_name}", color="green")
-            output.print_section_item(f"[+] Shipstation: {shipstation}", color="green")
-
-            response = shipstation.post(endpoint=f"/stores/refreshstore?storeId={store_id}")
-            response_json = response.json()
-            output.print_section_item(f"[+] Response: {response_json}", color="green")
-            response.raise_for_status()
-
-            response_json = response.json()
-            if response_json["success"] != 'true':
-                raise RuntimeError(f"200 Code but not able to refresh {store_name}")
-            time.sleep(0.5)
-            
-        except requests.exceptions.HTTPError as e:
-            print(f"[X] Error: Unable to refresh store {store_name}")
-            print(response.status_code)
-            print(e)
+    # Refresh requests are independent, send them all at once instead of one after the other
+    with ThreadPoolExecutor(max_workers=min(_MAX_SHIPSTATION_WORKERS, len(store_refreshes))) as executor:
+        _refresh_all(store_refreshes, executor)
 
 
 # Used for Debugging Only
@@ -101,34 +336,54 @@ def fetch_order(client, order_Id):
 
 
 
-def fetch_orders_with_retry(dict_of_shipstation_clients, max_retries=10, delay=5):
+def fetch_orders_with_retry(dict_of_shipstation_clients):
     """
-        Attempts to fetch orders with a specified number of retries.
+        Refreshes the stores from get_store_ids(), then fetches the awaiting_shipment orders of every account.
+        Orders are fetched account-wide, orders of _BAD_STORES are dropped later by decode_response.
+        Pages hold _ORDERS_PAGE_SIZE orders; once page 1 of an account says how many pages there are, the rest are fetched concurrently.
+        Each request is retried on its own by the ShipStation client's session, so one transient failure
+        does not redo the requests that already succeeded.
 
         Args:
             dict_of_shipstation_clients (dict): Keys = name_of_store : Values =  The ShipStation connection object.
-            max_retries (int): Maximum number of retries.
-            delay (int): Delay between retries in seconds.
 
         Return:
-            response (requests.models.Response): The response object from the ShipStation API.
+            dict: Keys = name_of_store : Values = ([response per store page], ShipStation connection object), or None if a request kept failing.
     """
-    # Attempt to fetch orders with retries
-    for attempt in range(max_retries):
-        try:
-            for name_of_store, client_shipstation in dict_of_shipstation_clients.items():
-                refresh_stores(name_of_store, client_shipstation)
-
-                list_of_orders = []
-                dict_of_shipstation_clients[name_of_store] = (list_of_orders, client_shipstation)
-                list_of_orders.append(client_shipstation.fetch_orders(parameters={'order_status': 'awaiting_shipment'}))
-                # Sleep before switching shipstation_clients to avoid refresh_stores() timeout error
-                time.sleep(1.5)
-            return dict_of_shipstation_clients
-        except Exception as e:
-            print(f"[X] Attempt {attempt+1} failed with error: {e}")
-            time.sleep(delay)  # Wait before retrying
-    return None
+    # Every store of every account, refreshed together in one pool
+    store_refreshes = [
+        (client_shipstation, store_name, store_id)
+        for name_of_store, client_shipstation in dict_of_shipstation_clients.items()
+        for store_name, store_id in get_store_ids(name_of_store).items()
+    ]
+
+    try:
+        with ThreadPoolExecutor(max_workers=_MAX_SHIPSTATION_WORKERS) as executor:
+            # Orders are only fetched once all stores have pulled in their new orders
+            _refresh_all(store_refreshes, executor)
+
+            # Page 1 of every account, its "pages" field tells how many more pages the account has
+            first_pages = {
+                name_of_store: executor.submit(_fetch_awaiting, client_shipstation)
+                for name_of_store, client_shipstation in dict_of_shipstation_clients.items()
+            }
+
+            futures = {}
+            for name_of_store, first_page in first_pages.items():
+                client_shipstation = dict_of_shipstation_clients[name_of_store]
+                total_pages = json.loads(first_page.result().content).get("pages", 1)
+                futures[name_of_store] = [first_page] + [
+                    executor.submit(_fetch_awaiting, client_shipstation, page)
+                    for page in range(2, total_pages + 1)
+                ]
+
+            return {
+                name_of_store: ([future.result() for future in page_futures], dict_of_shipstation_clients[name_of_store])
+                for name_of_store, page_futures in futures.items()
+            }
+    except Exception as e:
+        print(f"[X] Fetching orders failed with error: {e}")
+        return None
 
 
 
@@ -183,42 +438,7 @@ def get_tag_id(order_object, tag_reason: str):
     if the tag_id is not available for the given store name and tag reason combination.
     """
 
-    # Keys are shipstation accounts and secondary keys are tag_reasons
-    account_tag_id_mapping = {
-        "nuveau": {
-            "Multi-Order"           : 52943,
-            "No-Dims"               : 52944,
-            "Ready"                 : 52987,
-            "No-DeliveryDate"       : 52992,
-            "No API Keys"           : 53068,
-            "No SS Carrier Rates"   : 53339,
-            "No UPS Rate"           : 53341,
-            "No USPS Rate"          : 53342,
-            "No Fedex Rate"         : 53343,
-            "Shipping not set"      : 53344,
-            "Double-Order"          : 53526
-        },
-        "lentics": {
-            "Multi-Order"           : 166210,
-            "No-Dims"               : 166211,
-            "Ready"                 : 166212,
-            "No-DeliveryDate"       : 166703,
-            "No API Keys"           : 166471,
-            "No SS Carrier Rates"   : 166704,
-            "No UPS Rate"           : 166702,
-            "No USPS Rate"          : 166701,
-            "No Fedex Rate"         : 166700,
-            "Shipping not set"      : 166699,
-            "Double-Order"          : 166945,
-        }
-    }
-
-    # Name of the ss_acount for the order
-    ss_account = order_object.store_name
-
-    tag_id = account_tag_id_mapping[ss_account][tag_reason]
-
-    return tag_id
+    return _TAG_IDS[order_object.store_name][tag_reason]
 
 
 
@@ -242,9 +462,11 @@ def tag_order(order_object, tag_reason: str):
         "tagId": tag_id
     }
 
+    # Stays None if the request itself fails
+    response = None
     try:
         # URL & Headers are included in the shipstation_client session
-        response = order_object.shipstation_client.post(endpoint="/orders/addtag", data=json.dumps(payload))
+        response = order_object.shipstation_client.post(endpoint="/orders/addtag", data=_dumps(payload))
         response.raise_for_status()
 
         response_json = response.json()
@@ -256,8 +478,9 @@ def tag_order(order_object, tag_reason: str):
 
     except Exception as e:
         output.print_section_item(f"[X] Warning could not tag order: {order_object.order_id}", color="yellow")
-        print(response.status_code)
-        print(response.text)
+        if response is not None:
+            print(response.status_code)
+            print(response.text)
         print(e)
 
         return False
@@ -265,6 +488,41 @@ def tag_order(order_object, tag_reason: str):
 
 
 
+def queue_tag(order_object, tag_reason: str):
+    """
+    Queues a tag for the order instead of POSTing it right away. ShipStation only tags one order per
+    /orders/addtag request, so queued tags are sent concurrently by flush_tags().
+    Use tag_order() directly when the result is needed immediately.
+    """
+    with _TAG_QUEUE_LOCK:
+        _TAG_QUEUE.append((order_object, tag_reason))
+
+
+
+def flush_tags(max_workers=_MAX_TAG_WORKERS):
+    """
+    Sends every queued tag concurrently and empties the queue.
+
+    Return:
+        int: The number of orders tagged successfully.
+    """
+    with _TAG_QUEUE_LOCK:
+        queued_tags = list(_TAG_QUEUE)
+        _TAG_QUEUE.clear()
+
+    if not queued_tags:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(queued_tags))) as executor:
+        futures = [executor.submit(tag_order, order_object, tag_reason) for order_object, tag_reason in queued_tags]
+        tagged = sum(1 for future in as_completed(futures) if future.result())
+
+    output.print_section_item(f"[+] Tagged {tagged}/{len(queued_tags)} orders", color="green")
+    return tagged
+
+
+
+
 def multi_dims_lentics(order):
     '''
     Sets weight and demensions for multi-orders from Lentics Shipstation account
@@ -277,89 +535,56 @@ def multi_dims_lentics(order):
         - order: Order object containing shipment information.
 
         Returns:
-        - list_of_box_sizes: A list of box sizes determined based on the order's items.
+        - list_of_box_sizes: A list of (box size, quantity) pairs, one per line item, or None as soon as an item has no size info.
 
         Algorithm:
         1. Iterate through the items in the order.
         2. Determine the size (dirived from warehouse location) and qunatity for each item.
-        3. Use the `get_box_sizes` function to calculate box sizes based on the location and quantity.
-        4. Append the calculated box sizes to the list_of_box_sizes.
+        3. Use the `get_box_sizes` function to look up the box size based on the location.
+        4. Append the (box size, quantity) pair to the list_of_box_sizes.
 
         Note: The `get_box_sizes` function retrieves size information from predefined mappings for Stallion and Lentics products.
 
         """
         def get_box_sizes(quantity, warehouse_location):
             """
-            Get list of box sizes based on the quantity and size of an item.
+            Get the box size of an item paired with its quantity.
 
             Parameters:
             - quantity: The quantity of the item.
             - warehouse_location: The warehouse location information, repuposed to pass size information from shipstation api
 
             Returns:
-            - box_sizes: A list of dictionaries containing box dimensions and weight information.
+            - box_sizes: A (box dict, quantity) tuple, or None if the size code is unknown.
 
             Algorithm:
             1. Determine the type of product based on the warehouse location prefix ('ST' for Stallion, others for Lentics).
             2. Extract the size code from the warehouse location.
-            3. Check if the size code exists in the corresponding mapping (stallion_mapping for Stallion, lentics_mapping for Lentics).
-            4. If the size code is found, append the corresponding size information to box_sizes based on the quantity.
-            5. Return the list of box sizes.
+            3. Check if the size code exists in the corresponding mapping (_STALLION_MAPPING for Stallion, _LENTICS_MAPPING for Lentics).
+            4. If the size code is found, pair the corresponding size information with the quantity.
+            5. Return the pair, or None if the size code is not found.
 
-            Note: The stallion_mapping and lentics_mapping dictionaries contain predefined size information for different product types.
-            Note: Both multi_orders and double_orders can contain items with quantity > 1, this is why we range(quantity) within the func.
+            Note: The _STALLION_MAPPING and _LENTICS_MAPPING module constants contain predefined size information for different product types.
+            Note: Both multi_orders and double_orders can contain items with quantity > 1, the quantity is kept with the box
+            so the totals are weighted by it instead of repeating the box once per unit.
 
             Example Usage:
             box_sizes = get_box_sizes(2, 'ST | 2024')
-            # Returns [{'L': 23, 'W': 31, 'H': 2.0, 'Ounces': 96}, {'L': 23, 'W': 31, 'H': 2.0, 'Ounces': 96}]
+            # Returns ({'L': 23, 'W': 31, 'H': 2.0, 'Ounces': 96}, 2)
 
             """
-            # Weight & dimensions info for Stallion products
-            stallion_mapping = {
-                "1218" : {"L" : 16, "W": 20, "H": 2.0, "Ounces": 80},
-                "1620" : {"L" : 19, "W": 25, "H": 2.0, "Ounces": 96},
-                "1236" : {"L" : 20, "W": 35, "H": 2.0, "Ounces": 128},
-                "1823" : {"L" : 19, "W": 25, "H": 2.0, "Ounces": 96},
-                "1824" : {"L" : 19, "W": 25, "H": 2.0, "Ounces": 96},
-                "2024" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
-                "2026" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
-                "2228" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
-                "2325" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
-                "2329" : {"L" : 23, "W": 31, "H": 2.0, "Ounces": 96},
-                "2335" : {"L" : 26, "W": 38, "H": 2.0, "Ounces": 128},
-                "2430" : {"L" : 26, "W": 28, "H": 2.0, "Ounces": 128},
-                "2435" : {"L" : 26, "W": 28, "H": 2.0, "Ounces": 128},
-                "2436" : {"L" : 26, "W": 28, "H": 2.0, "Ounces": 128},
-                "2638" : {"L" : 41, "W": 29, "H": 2.0, "Ounces": 128},
-                "2739" : {"L" : 41, "W": 29, "H": 2.0, "Ounces": 128},
-                "2839" : {"L" : 41, "W": 29, "H": 2.0, "Ounces": 128},
-                "2531" : {"L" : 26, "W": 28, "H": 2.0, "Ounces": 128},
-                "0810" : {"L" : 13, "W": 13, "H": 1.0, "Ounces": 32},
-            }
-
-            # Weight & dimensions info for Lentics products
-            lentics_mapping = {
-                "F1" : {"L" : 20, "W": 16, "H": 1.5, "Ounces": 32},
-                "P1" : {"L" : 13, "W": 18, "H": 0.1, "Ounces": 8},
-                "P3" : {"L" : 17, "W": 17, "H": 0.1, "Ounces": 8},
-                "F2" : {"L" : 28, "W": 24, "H": 2.0, "Ounces": 96},
-                "O2" : {"L" : 19, "W": 19, "H": 1.5, "Ounces": 38}
-            }
-
-            # Initiate target variable
-            box_sizes = []
-
             if warehouse_location.startswith("ST"): # this is Stallion product
                 size_code = warehouse_location[5:]
-                if size_code in stallion_mapping:
-                    for _ in range(quantity):
-                        box_sizes.append(stallion_mapping.get(size_code, None))
+                dims = _STALLION_MAPPING.get(size_code)
             else: # Lentics Product
-                size_code = (lambda text: text[text.find('|') + 2:])(warehouse_location)
-                if size_code in lentics_mapping:
-                    for _ in range(quantity):
-                        box_sizes.append(lentics_mapping.get(size_code, None))
-            return box_sizes
+                size_code = warehouse_location.partition('| ')[2]
+                dims = _LENTICS_MAPPING.get(size_code)
+
+            # Unknown size code, None tells the caller to stop right away
+            if dims is None:
+                return None
+
+            return dims, quantity
 
 
         # Initialize target variable
@@ -377,10 +602,11 @@ def multi_dims_lentics(order):
                 quantity = product_info['quantity']
                 warehouse_location = product_info['warehouseLocation']  # This shipstation field is repurposed to carry hidden message about product size
                 box_sizes = get_box_sizes(quantity, warehouse_location)
+                # No need to look at the remaining items once one is missing size info
+                if box_sizes is None:
+                    return None
 
-                # Handles for when quantity of product > 1
-                for box_size in box_sizes:
-                    list_of_box_sizes.append(box_size)
+                list_of_box_sizes.append(box_sizes)
 
         # Items in order are a list, one item with quantity > 1
         elif order.is_double_order:
@@ -388,7 +614,10 @@ def multi_dims_lentics(order):
             # Main business logic
             quantity = items_list[0]['quantity']
             warehouse_location = items_list[0]['warehouseLocation']  # This field is repurposed to carry hidden message about product size
-            list_of_box_sizes = get_box_sizes(quantity, warehouse_location)
+            box_sizes = get_box_sizes(quantity, warehouse_location)
+            if box_sizes is None:
+                return None
+            list_of_box_sizes.append(box_sizes)
         
 
         return list_of_box_sizes
@@ -396,15 +625,28 @@ def multi_dims_lentics(order):
 
     # Every item in the order has a box size
     list_of_box_sizes = list_box_sizes(order)
-    
+
     # If any product is missing size info, False is used as a warning
-    if None in list_of_box_sizes:
+    if list_of_box_sizes is None:
         return False
     
-    # Calculate total size and weight
-    biggest_box = max(list_of_box_sizes, key=lambda x: x["L"] + x["W"])
-    total_weight = sum(box["Ounces"] for box in list_of_box_sizes)
-    total_height = sum(box["H"] for box in list_of_box_sizes)
+    # Single pass over line items: find the biggest box (by L + W) and total up height & weight weighted by quantity
+    biggest_box = None
+    biggest_size = -1
+    total_weight = 0
+    total_height = 0
+    for box, quantity in list_of_box_sizes:
+        if quantity <= 0:
+            continue
+        box_size = box["L"] + box["W"]
+        if box_size > biggest_size:
+            biggest_box, biggest_size = box, box_size
+        total_weight += box["Ounces"] * quantity
+        total_height += box["H"] * quantity
+
+    # No items with size info at all
+    if biggest_box is None:
+        return False
 
     # Update the Order Object attributes
     order.Shipment.length = biggest_box["L"]
@@ -428,15 +670,15 @@ def multi_dims_nuveau(order):
         - order: An object representing an order, containing information about items and quantities.
 
         Returns:
-        - list_of_box_sizes: A list of dictionaries containing box dimensions and weight information for the items in the order.
+        - list_of_box_sizes: A list of (box size, quantity) pairs for the items in the order, or None as soon as an item has no size info.
 
         Algorithm:
         1. Define a mapping between SKU names and their corresponding dimensions and weights.
         2. Define a list of specific SKU names for Billy Bass products.
-        3. Implement the get_box_sizes function to calculate box sizes based on SKU and quantity.
+        3. Implement the get_box_sizes function to pair the box size of a SKU with its quantity.
         4. Iterate through the items in the order:
-        - For multi-order items, calculate box sizes based on each prodcuts SKU and quantity using get_box_sizes.
-        - For double-order items, calculate box sizes based on the first item's SKU and quantity using get_box_sizes.
+        - For multi-order items, look up the box size of each prodcuts SKU using get_box_sizes.
+        - For double-order items, look up the box size of the first item's SKU using get_box_sizes.
         - Raise a RuntimeError if neither multi-order nor double-order criteria are met.
 
         Note: This function assumes certain attributes and structures within the order object, such as 'is_multi_order', 'is_double_order', 'Shipment', 'items_dict', and 'items_list'.
@@ -444,13 +686,13 @@ def multi_dims_nuveau(order):
         Example Usage:
         order = ...
         box_sizes = list_box_sizes(order)
-        # Returns [{'L': 13, 'W': 18, 'H': 0.1, 'Weight': 8}] or similar list of box size dictionaries.
+        # Returns [((13, 18, 0.1, 8), 1)] or similar list of (box size, quantity) pairs.
 
         """
 
         def get_box_sizes(sku, quantity):
             """
-            Calculate box sizes based on SKU and quantity.
+            Pair the box size of a SKU with its quantity.
 
             Parameters:
             - sku: str
@@ -459,60 +701,33 @@ def multi_dims_nuveau(order):
                 The quantity of the product.
 
             Returns:
-            - list
-                A list of dictionaries containing box dimensions and weight information.
+            - tuple
+                A (box size, quantity) pair, or None if the SKU prefix is unknown.
 
             Description:
-            This function calculates the box sizes based on the given SKU and quantity. It uses predefined mappings between SKUs and their corresponding dimensions and weights. If the SKU is not in the list of specific Billy Bass SKUs, it calculates the box sizes based on the SKU prefix using the dimensions_to_sku_mapping. If the SKU is in the list of Billy Bass SKUs, it uses predefined dimensions for Billy Bass products.
+            This function looks up the box size of the given SKU and pairs it with the quantity. It uses predefined mappings between SKUs and their corresponding dimensions and weights. If the SKU is not in the list of specific Billy Bass SKUs, it calculates the box sizes based on the SKU prefix using _DIMENSIONS_TO_SKU_MAPPING. If the SKU is in the list of Billy Bass SKUs, it uses predefined dimensions for Billy Bass products.
 
             Example:
             sku = 'P1'
             quantity = 5
             box_sizes = get_box_sizes(sku, quantity)
-            # Returns [{'L': 13, 'W': 18, 'H': 0.1, 'Weight': 8}, ...] or a similar list of dictionaries with box size information.
+            # Returns ((13, 18, 0.1, 8), 5) or a similar pair with box size information.
             """
 
-            list_of_billyBass_skus = ['M-BBass 2', 'Billy Bass 02', 'Gemmy01', 'Gemmy03', 'Gemmy Big Mouth Billy Bass 3', 
-                                    'Gemmy BBass3', 'M-BBass', 'Billy Bass Original', 'L-BBass1', 'L-BBass2', 'L-BBass3']
-
-            list_of_fresh_stools = ['Gel Replacment 8 Pack', 'FS-Black', 'FS- White + 4 Gels', 'FS- White', 'FS- Pink', 'FS- Gray', 
-                                    'FS- Blue', 'FS- Black', 'FS - White', 'FS - Pink + 4 Gels', 'FS - Pink', 'FS - Gray + 4 Gels', 
-                                    'FS - Gray', 'FS - Blue + 4 Gels', 'FS - Blue', 'FS - Black']
-            # Establish SKU/Dimensions Mapping --> keys: (Lenght/in, Width/in, Height/in, Weight/lbs) -> Values: sku names
-            dimensions_to_sku_mapping = {
-                'P1': (13, 18, 0.1, 8),
-                'P2': (13, 18, 0.1, 8),
-                'F1': (22, 15, 1.5, 40),
-                'T1': (22, 16.5, 1.5, 50),
-                'F2': (28, 22, 1.5, 80),
-                'T2': (28, 22, 1.5, 80),
-                'F3': (41, 29, 2.0, 176),
-                'T3': (41, 29, 2.0, 192),
-                'O2': (21, 20, 1.5, 48),
-                'O3': (28, 27, 1.5, 96),
-                'O4': (21, 29, 1.5, 136),
-                'BB': (12.5, 8.5, 4.5, 32),
-                'FS': (15.75, 8.75, 3.25, 32)
-            }
-
-            # Initiate target varaible
-            box_sizes = []
-
-            if sku in list_of_billyBass_skus:
-                for _ in range(quantity):
-                    box_sizes.append(dimensions_to_sku_mapping['BB'])
+            if sku in _BILLY_BASS_SKUS:
+                return _DIMENSIONS_TO_SKU_MAPPING['BB'], quantity
 
-            if sku in list_of_fresh_stools:
-                dims = dimensions_to_sku_mapping['FS']
-                # If the skus includes 4 Gels then add 16oz to the weight
+            if sku in _FRESH_STOOL_SKUS:
+                length, width, height, weight = _DIMENSIONS_TO_SKU_MAPPING['FS']
+                # If the skus includes 4 Gels then add 16oz to the weight (new tuple, the shared one is immutable)
                 if '+' in sku:
-                    dims[3] += 16
-                box_sizes.append(dims)
+                    weight += 16
+                return (length, width, height, weight), quantity
 
-            else:
-                for _ in range(quantity):
-                    box_sizes.append(dimensions_to_sku_mapping.get(sku[:2], None))
-            return box_sizes
+            dims = _DIMENSIONS_TO_SKU_MAPPING.get(sku[:2])
+            if dims is None:
+                return None
+            return dims, quantity
 
         # Initiate target variable
         list_of_box_sizes = []
@@ -525,17 +740,21 @@ def multi_dims_nuveau(order):
                 order.Shipment.item_sku = sku
 
                 box_sizes = get_box_sizes(sku, quantity)
+                # No need to look at the remaining items once one is missing size info
+                if box_sizes is None:
+                    return None
 
-                # Handles for when quantity of product > 1
-                for box_size in box_sizes:
-                    list_of_box_sizes.append(box_size)
+                list_of_box_sizes.append(box_sizes)
 
         elif order.is_double_order:
             items_list = order.Shipment.items_list
             quantity = items_list[0]["quantity"]
             sku = items_list[0]["sku"]
 
-            list_of_box_sizes = get_box_sizes(sku, quantity)
+            box_sizes = get_box_sizes(sku, quantity)
+            if box_sizes is None:
+                return None
+            list_of_box_sizes.append(box_sizes)
 
         else:
             # If neither criteria are true, then something is wrong
@@ -546,15 +765,25 @@ def multi_dims_nuveau(order):
     # Initialize target variable
     list_of_box_sizes = list_box_sizes(order)
 
-
     # If any product is missing size info, False is used as a warning
-    if None in list_of_box_sizes:
+    if list_of_box_sizes is None:
+        return False
+
+    # Single pass over line items: find the longest box and total up height & weight weighted by quantity
+    biggest_box = None
+    total_weight = 0
+    total_height = 0
+    for box, quantity in list_of_box_sizes:
+        if quantity <= 0:
+            continue
+        if biggest_box is None or box[0] > biggest_box[0]:
+            biggest_box = box
+        total_weight += box[-1] * quantity
+        total_height += box[-2] * quantity
+
+    # No items with size info at all
+    if biggest_box is None:
         return False
-    
-    # Calculate new sizes
-    biggest_box = max(list_of_box_sizes, key=lambda x: x[0])
-    total_weight = sum(index[-1] for index in list_of_box_sizes)
-    total_height = sum(index[-2] for index in list_of_box_sizes)
 
     # Update Order Attributes
     length = biggest_box[0]
@@ -575,18 +804,22 @@ def multi_dims_nuveau(order):
 
 
 
+# SS_account -> function setting the dims for its multi-orders
+_DIMS_DISPATCH = {
+    "nuveau": multi_dims_nuveau,
+    "lentics": multi_dims_lentics
+}
+
+
+
 def set_dims_for_multi_order(order):
     '''
     Routes Order to the correct dims setting function depending on orders' SS_account
     '''
-    if order.store_name == "nuveau":
-        success = multi_dims_nuveau(order)
-        return success
-    elif order.store_name == "lentics":
-        success = multi_dims_lentics(order)
-        return success
-    else:
+    set_dims = _DIMS_DISPATCH.get(order.store_name)
+    if set_dims is None:
         raise RuntimeError(f"[X] Multi-Order object has no dimension setting function for it's storename {order.store_name}")
+    return set_dims(order)
     
 
 
@@ -596,18 +829,35 @@ def check_if_multi_order(order_object):
     # Handles scenario when 2 items of same and/or different skus are ordered
     if len(order_object.Shipment.items_list) > 1:
         order_object.is_multi_order = True
-        tag_order(order_object, "Multi-Order")
+        queue_tag(order_object, "Multi-Order")
 
     # Handles scenario when 2 or more of the same items are ordered (only same sku)
     item_quantity = order_object.Shipment.items_list[0]['quantity']
     if item_quantity > 1:
         order_object.is_double_order = True
-        tag_order(order_object, "Double-Order")
+        queue_tag(order_object, "Double-Order")
+
+
+def _build_order(order, store_name, shipstation_client):
+    """
+    Initiates one raw ShipStation order into an Order object, sets its ship from location
+    and handles the extra multi-order initiation (queueing its tag for flush_tags()).
+    """
+    order_object = Order(order, store_name)
+    order_object.shipstation_client = shipstation_client
+    set_order_shipfrom_location(order_object)
+
+    # Handles extra initiation logic when order is multi-order
+    check_if_multi_order(order_object)
+
+    return order_object
+
 
 
 def decode_response(dict_of_order_responses):
     """
         Decode the response from the ShipStation API and print the order details.
+        Orders are initiated concurrently; the Multi/Double-Order tags they need are sent together at the end.
 
         Args:
             list_of_order_responses (list): The list of responses from the ShipStation API.
@@ -615,59 +865,66 @@ def decode_response(dict_of_order_responses):
             None
     """
     list_of_objects = []
-    for store_name, response in dict_of_order_responses.items():
-        for res in response[0]:
-            if int(res.status_code) == 200:
-                # Decode bytes to string
-                response_str = res.content.decode('utf-8')
-
-                # Parse string to Python object
-                response_json = json.loads(response_str)
-
-                if response_json["orders"] != []:
-                    try:
+    with ThreadPoolExecutor(max_workers=_MAX_ORDER_WORKERS) as executor:
+        for store_name, response in dict_of_order_responses.items():
+            for res in response[0]:
+                if int(res.status_code) == 200:
+                    # json.loads takes the raw bytes, no need to decode them to a str first
+                    response_json = json.loads(res.content)
+
+                    if response_json["orders"] != []:
+                        futures = []
                         for order in response_json["orders"]:
-                            # Manually created orders
-                            bad_stores = [165349, 203468, 325291, 433937]
-                            if order['advancedOptions']['storeId'] in bad_stores:
-                                continue
-
-                            # Pop Creations Order
-                            if order['advancedOptions']['warehouseId'] == 779978:
-                                continue
-
-                            # Issue with order in Shipstation
-                            if order['orderTotal'] == 0.0:
+                            # Skip on the raw dict, before any Order object is built:
+                            # manually created orders, Pop Creations orders, orders with an issue in Shipstation ($0 total)
+                            # and orders shipping to Puerto Rico
+                            advanced_options = order['advancedOptions']
+                            if (advanced_options['storeId'] in _BAD_STORES
+                                    or advanced_options['warehouseId'] == _POP_WAREHOUSE_ID
+                                    or order['orderTotal'] == 0.0
+                                    or (order['shipTo']['state'] or '').upper() == "PR"):
                                 continue
 
-
                             # Initiate orders into class
-                            order_object = Order(order, store_name)
-                            order_object.shipstation_client = response[1]
-                            set_order_shipfrom_location(order_object)
+                            futures.append((order, executor.submit(_build_order, order, store_name, response[1])))
+
+                        # Collected in submission order so orders keep ShipStation's ordering
+                        for order, future in futures:
+                            try:
+                                list_of_objects.append(future.result())
+                            except Exception as e:
+                                _FAILED_ORDERS.append(order)
+                                output.print_section_item(f"[X] Failed to decode order {order.get('orderNumber', '?')}. Error: {e}", color="red")
+                    else:
+                        # There are no orders for this store, continue to next Shipstation Account
+                        print(f"[X] No orders with order_status of awaiting_shipment found this store: {store_name}")
+                        continue
+                    
+                else:
+                    print(f"[X] Failed to fetch orders. Status code: {response.status_code}")
 
-                            # Skip orders shipping to Puerto Rico
-                            if order_object.Customer.state.upper() == "PR":
-                                continue
+    # Multi/Double-Order tags queued while initiating the orders
+    flush_tags()
 
-                            # Handles extra initiation logic when order is multi-order
-                            check_if_multi_order(order_object)
+    if _FAILED_ORDERS:
+        write_failed_orders()
 
-                            list_of_objects.append(order_object)
+    return list_of_objects
 
-                    except Exception as e:
-                        print(f"[X] Failed to decode response. Error: {e}")
-                        import pprint
-                        pprint.pprint(order, indent=4)
-                else:
-                    # There are no orders for this store, continue to next Shipstation Account
-                    print(f"[X] No orders with order_status of awaiting_shipment found this store: {store_name}")
-                    continue
-                
-            else:
-                print(f"[X] Failed to fetch orders. Status code: {response.status_code}")
 
-    return list_of_objects
+
+def write_failed_orders():
+    '''
+    Writes the raw orders that failed to decode to _FAILED_ORDERS_PATH in one go, then empties the buffer
+    '''
+    try:
+        with open(_FAILED_ORDERS_PATH, "w") as file:
+            json.dump(list(_FAILED_ORDERS), file, separators=(",", ":"))
+        output.print_section_item(f"[X] {len(_FAILED_ORDERS)} failed orders written to {_FAILED_ORDERS_PATH}", color="red")
+    except OSError as e:
+        print(f"[X] Could not write failed orders: {e}")
+    finally:
+        _FAILED_ORDERS.clear()
 
 
 
@@ -676,28 +933,14 @@ def set_order_shipfrom_location(order):
     '''
     Initializes shipfrom attributes for Order Object based on warehouseID
     '''
-    michigan_warehouse_ids = [486100, 98792, 1097041, 505774, 857645, 1097039]
-    stallion_warehouse_ids = [1097040, 665600]
-
-    if order.order_warehouseId in michigan_warehouse_ids:
-        order.Shipment.from_postal_code = "49022"
-        order.Shipment.from_city = "Benton Harbor"
-        order.Shipment.from_state = "MI"
-        order.Shipment.from_country = "US"
-        order.Shipment.from_address = "3329 Territorial Rd"
-        order.Shipment.from_name = "Shipping Department"
-
-    elif order.order_warehouseId in stallion_warehouse_ids:
-        order.Shipment.from_postal_code = "46203"
-        order.Shipment.from_city = "Indianapolis"
-        order.Shipment.from_state = "IN"
-        order.Shipment.from_country = "US"
-        order.Shipment.from_address = "1435 E Naomi St"
-        order.Shipment.from_name = "Shipping Department"
+    ship_from = _SHIPFROM_BY_WAREHOUSE.get(order.order_warehouseId)
 
-    else:
+    if ship_from is None:
         info_statement = f"ID = {order.order_key}\n Warehouse = {order.order_warehouseId}\n SS_account = {order.store_name}"
         raise RuntimeError(f"No Ship From Location for Order -> {info_statement}")
+
+    for attribute, value in ship_from.items():
+        setattr(order.Shipment, attribute, value)
     
     return None
 
@@ -738,13 +981,12 @@ def set_order_warehouse_location(order):
                     }
 
     try:
-        response = order.shipstation_client.put(endpoint=f"/products/{product_Id}", data=json.dumps(payload))
+        response = order.shipstation_client.put(endpoint=f"/products/{product_Id}", data=_dumps(payload))
         response.raise_for_status()
-        print(response.status_code)
+        output.print_section_item(f"[+] Warehouse Location set for order: {order.order_number} ({response.status_code})", log_level="debug")
 
     except Exception as e:
-        print(f"Could not set Warhouse Location for order: {order.order_number}")
-        print(e)
+        output.print_section_item(f"[X] Could not set Warhouse Location for order: {order.order_number}. Error: {e}", log_level="error", color="red")
     return None
 
 
@@ -758,11 +1000,7 @@ def is_po_box_delivery(order):
     Return:
         (bool) True is order is delivering to PO Box: else False
     """
-    customer_address = order.Customer.address1
-
-    if "PO Box".upper() in customer_address.upper():
-        return True
-    return False
+    return _PO_BOX_PATTERN.search(order.Customer.address1 or '') is not None
 
 
 
@@ -777,14 +1015,19 @@ def list_packages(dict_of_shipstation_clients):
     '''
     print(dict_of_shipstation_clients)
     
-    list_of_carriers = ["ups", "fedex", "ups_walleted", "stamps_com"]
-
-    package_codes = {}
-    for store_name, ss_client in dict_of_shipstation_clients.items():
-        package_codes[store_name] = {}  # Initialize package_codes[store_name] here
-        for carrierCode in list_of_carriers:
+    package_codes = {store_name: {} for store_name in dict_of_shipstation_clients}
+
+    # One independent GET per store & carrier, all sent at once
+    with ThreadPoolExecutor(max_workers=_MAX_SHIPSTATION_WORKERS) as executor:
+        futures = {
+            executor.submit(ss_client.get, endpoint=f"/carriers/listpackages?carrierCode={carrierCode}"): (store_name, carrierCode)
+            for store_name, ss_client in dict_of_shipstation_clients.items()
+            for carrierCode in _RATE_CARRIERS
+        }
+        for future in as_completed(futures):
+            store_name, carrierCode = futures[future]
             try:
-                response = ss_client.get(endpoint=f"/carriers/listpackages?carrierCode={carrierCode}")
+                response = future.result()
                 response.raise_for_status()  # Raise exception for non-200 status codes
                 package_codes[store_name][carrierCode] = response.json()
             except Exception as e:
@@ -806,82 +1049,110 @@ def set_payload_for_rates(order, carrier):
     Return:
         payload (dict): Returns the correct payload for each condition
     '''
+    # Bound once, both are read for most fields below
+    shipment = order.Shipment
+    customer = order.Customer
+
+    # Static fields come from the template, only the order dependent ones are filled in here.
+    # weight & dimensions stay per-payload dicts because the Billy Bass edge case below edits them
     payload = {
+                    **_RATES_PAYLOAD_TEMPLATE,
                     "carrierCode": carrier,
-                    "serviceCode": None,
-                    "packageCode": "package",
-                    "fromPostalCode": order.Shipment.from_postal_code,
-                    "fromcity": order.Shipment.from_city,
-                    "fromState": order.Shipment.from_state.upper(),
+                    "fromPostalCode": shipment.from_postal_code,
+                    "fromcity": shipment.from_city,
+                    "fromState": shipment.from_state.upper(),
                     "fromWarehouseId": order.order_warehouseId,
-                    "toState": order.Customer.state.title(),
-                    "toCountry": order.Customer.country if order.Customer.country in ["US", "CA"] else 'US',
-                    "toPostalCode": order.Customer.postal_code,
-                    "toCity": order.Customer.city.title(),
+                    "toState": customer.state.title(),
+                    "toCountry": customer.country if customer.country in ["US", "CA"] else 'US',
+                    "toPostalCode": customer.postal_code,
+                    "toCity": customer.city.title(),
                     "weight": {
-                        "value": order.Shipment.weight["value"],
+                        "value": shipment.weight["value"],
                         "units": "ounces"
                     },
                     "dimensions": {
                         "units": "inches",
-                        "length": int(order.Shipment.length),
-                        "width": int(order.Shipment.width),
-                        "height": int(order.Shipment.height)
+                        "length": int(shipment.length),
+                        "width": int(shipment.width),
+                        "height": int(shipment.height)
                     },
                     "confirmation": order.confirmation,
-                    "residential": order.Customer.is_residential
+                    "residential": customer.is_residential
                 }
 
-    list_of_billy_bass_skus = ["M-BBass 2", "Billy Bass 02", "Gemmy03", "Gemmy01", 
-                            "Gemmy Big Mouth Billy Bass 3", "Gemmy BBass3", "M-BBass", 
-                            "Billy Bass Original", "L-BBass1", "L-BBass2", "L-BBass3"]
-
-
-    item_sku = order.Shipment.item_sku
+    item_sku = shipment.item_sku
     # Billy Bass skus have unique height measurements for stamps_com
-    if carrier == "stamps_com" and item_sku in list_of_billy_bass_skus:
+    if carrier == "stamps_com" and item_sku in _BILLY_BASS_SKUS:
             payload["dimensions"]["height"] = int(1)
 
     # Orders going to PR usually have country set to US, this causes error with shipping carrier APIs
-    if order.Customer.state.upper() == "PR": # Used as state code
-        order.Customer.country = "PR" # Two letter code for country happens to be the same
+    if customer.state_upper == "PR": # Used as state code
+        customer.country = "PR" # Two letter code for country happens to be the same
 
     return payload
 
 
 
+def _post_rates(order_object, payload):
+    """
+        Posts one carrier's /shipments/getrates request.
+
+        Return:
+            list: The services quoted by the carrier, or None on a 500 (package details not valid for the carrier).
+        Raises:
+            requests.exceptions.RequestException: On a failed request or any other 4xx/5xx.
+    """
+    response = order_object.shipstation_client.post(endpoint="/shipments/getrates", data=_dumps(payload))
+    # Usually raised when package details aren't valid for specific carrier
+    if response.status_code == 500:
+        return None
+    response.raise_for_status()  # Raises a HTTPError if the status is 4xx, 5xx
+    return response.json()
+
+
+
 def get_rates_for_all_carriers(order_object):
     """
-        Fetch the list of carriers and services from the ShipStation API.
+        Fetch the rates of every carrier in _RATE_CARRIERS from the ShipStation API.
+        The carrier requests are independent, so they are sent concurrently and merged in carrier order.
+        Orders shipping from Stallion skip FedEx, which can never win for them; with no 'fedex' rates
+        the FedEx API quote is skipped as well.
 
         Args:
-            shipstation (ShipStation): The ShipStation connection object.
+            order_object (Order): The order to get rates for.
         Return:
-            None
+            bool: True if rates were requested for all carriers, False otherwise.
     """
-    list_of_carriers = ["ups", "fedex", "ups_walleted", "stamps_com"]
     try: 
-        for carrier in list_of_carriers:
-            try: 
-                payload = set_payload_for_rates(order_object, carrier)
-
-            # Usually raised when dimensions info is not provided for the order object --> TypeError for int() cannot take NoneType
-            except TypeError as e:
-                print(e)
-                tag_order(order_object, "No-Dims")
-                return False
-
-            try:
-                response = order_object.shipstation_client.post(endpoint="/shipments/getrates", data=json.dumps(payload))
-                # Usually raised when package details aren't valid for specific carrier
-                if response.status_code == 500:
+        try: 
+            carriers = _STALLION_RATE_CARRIERS if order_object.order_warehouseId in _STALLION_WAREHOUSE_IDS else _RATE_CARRIERS
+            payloads = [(carrier, set_payload_for_rates(order_object, carrier)) for carrier in carriers]
+
+        # Usually raised when dimensions info is not provided for the order object --> TypeError for int() cannot take NoneType
+        except TypeError as e:
+            output.print_section_item(f"[X] No dims for order: {order_object.order_number}. Error: {e}", log_level="error", color="red")
+            tag_order(order_object, "No-Dims")
+            return False
+
+        with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+            futures = [
+                (carrier, executor.submit(_post_rates, order_object, payload))
+                for carrier, payload in payloads
+            ]
+
+            for carrier, future in futures:
+                try:
+                    response_json = future.result()
+                except requests.exceptions.RequestException as e:
+                    output.print_section_item(f"[X] Could not get {carrier} rates for order: {order_object.order_number}. Error: {e}", log_level="error", color="red")
+                    return False
+
+                if response_json is None:
                     continue
-                response.raise_for_status()  # Raises a HTTPError if the status is 4xx, 5xx
 
-                # If the request is successful, no exception is raised
-                response_json = response.json()
                 for service in response_json:
-                    order_object.mapping_services[service['serviceName']] = service['serviceCode']
+                    # Keyed like winning_rate: its 'serviceCode' holds the service name and names repeat across carriers (ups / ups_walleted)
+                    order_object.mapping_services[(carrier, service['serviceName'])] = service['serviceCode']
                     total_cost = round(service['shipmentCost'] + service['otherCost'], 2)
                     service_tuple = (service['serviceName'], total_cost)
 
@@ -889,57 +1160,40 @@ def get_rates_for_all_carriers(order_object):
                         order_object.rates[carrier].append(service_tuple)
                     else:
                         order_object.rates[carrier] = [service_tuple]
-
-            
-            except requests.exceptions.RequestException as e:
-                print(f"An error occurred: {e}")
-                return False
         
         # If rates obtained for all carriers
         return True
     
     except Exception as e:
-        print(e)
+        output.print_section_item(f"[X] Could not get rates for order: {order_object.order_number}. Error: {e}", log_level="error", color="red")
         return False
     
 
 
 
 def set_payload_for_update_order(order_object):
+    # Bound once, these are read for most fields below
+    shipment = order_object.Shipment
+    customer = order_object.Customer
+    advanced_options = order_object.advanced_options
+    winning_rate = order_object.winning_rate
 
     # Handling an Edge case for certain product
-    if order_object.winning_rate["carrierCode"] == "stamps_com":
-        list_of_billy_bass_skus = ["M-BBass 2", "Billy Bass 02", "Gemmy03", "Gemmy01", "Gemmy Big Mouth Billy Bass 3", 
-                                "Gemmy BBass3", "M-BBass", "Billy Bass Original", "L-BBass1", "L-BBass2", "L-BBass3"]
-        if order_object.Shipment.item_sku in list_of_billy_bass_skus:
-            order_object.Shipment.height = int(1)
+    if winning_rate["carrierCode"] == "stamps_com":
+        if shipment.item_sku in _BILLY_BASS_SKUS:
+            shipment.height = int(1)
             order_object.package_code = 'package'
 
 
 
-    shipping_provider_id_mapping = {
-        "nuveau" : {
-            "stamps_com"    : 139051,
-            "ups"           : 659748,
-            "fedex"         : 203639,
-            "ups_walleted"  : 139292
-        },
-        "lentics" : {
-            "stamps_com"    : 89042,
-            "ups"           : 1227452,
-            "fedex"         : 465570,
-            "ups_walleted"  : 465647
-        }
-    }
-
     # Update the Shipping Account Billing info based on the winning carrier
-    winning_carrier_code = order_object.winning_rate["carrierCode"]
-    shipping_provider_Id = shipping_provider_id_mapping[order_object.store_name][winning_carrier_code]
-    order_object.advanced_options['billToParty'] = 'my_other_account'
-    order_object.advanced_options['billToMyOtherAccount'] = shipping_provider_Id
+    winning_carrier_code = winning_rate["carrierCode"]
+    shipping_provider_Id = _SHIPPING_PROVIDER_IDS[order_object.store_name][winning_carrier_code]
+    advanced_options['billToParty'] = 'my_other_account'
+    advanced_options['billToMyOtherAccount'] = shipping_provider_Id
 
     # Write SmartPost delivery date to field
-    order_object.advanced_options['customField2'] = order_object.Shipment.smart_post_date
+    advanced_options['customField2'] = shipment.smart_post_date
 
 
     if not order_object.order_warehouseId:
@@ -952,36 +1206,36 @@ def set_payload_for_update_order(order_object):
         "paymentDate": order_object.payment_date,
         "shipByDate": order_object.shipByDate,
         "orderStatus": order_object.order_status,
-        "customerId": order_object.Customer.id,
-        "customerUsername": order_object.Customer.username,
-        "customerEmail": order_object.Customer.email,
-        "billTo": order_object.Customer.billToDict,
-        "shipTo": order_object.Customer.shipToDict,
-        "items": order_object.Shipment.items_list,
+        "customerId": customer.id,
+        "customerUsername": customer.username,
+        "customerEmail": customer.email,
+        "billTo": customer.billToDict,
+        "shipTo": customer.shipToDict,
+        "items": shipment.items_list,
         "amountPaid": order_object.amount_paid,
         "taxAmount": order_object.tax_amount,
-        "shippingAmount": order_object.Shipment.shipping_amount,
-        "customerNotes": order_object.Customer.notes,
-        "internalNotes": order_object.Customer.internal_notes,
+        "shippingAmount": shipment.shipping_amount,
+        "customerNotes": customer.notes,
+        "internalNotes": customer.internal_notes,
         "gift": order_object.is_gift,
         "giftMessage": order_object.gift_message,
         "paymentMethod": order_object.payment_method,
-        "requestedShippingService": order_object.winning_rate["serviceCode"],
-        "carrierCode": order_object.winning_rate["carrierCode"],
-        "serviceCode": order_object.mapping_services[order_object.winning_rate["serviceCode"]],
+        "requestedShippingService": winning_rate["serviceCode"],
+        "carrierCode": winning_rate["carrierCode"],
+        "serviceCode": order_object.mapping_services[(winning_rate["carrierCode"], winning_rate["serviceCode"])],
         "packageCode": order_object.package_code,
         "confirmation": order_object.confirmation,
         "shipDate": order_object.ship_date,
-        "weight": order_object.Shipment.weight,
+        "weight": shipment.weight,
         "dimensions": {
-            "length": order_object.Shipment.length, 
-            "width": order_object.Shipment.width,
-            "height": order_object.Shipment.height,
+            "length": shipment.length, 
+            "width": shipment.width,
+            "height": shipment.height,
             "units": "inches"
             },
-        "insuranceOptions": order_object.Shipment.insurance_options,
-        "internationalOptions": order_object.Shipment.internal_options,
-        "advancedOptions": order_object.advanced_options,
+        "insuranceOptions": shipment.insurance_options,
+        "internationalOptions": shipment.internal_options,
+        "advancedOptions": advanced_options,
         "tagIds": order_object.tag_ids,
     }
 
@@ -1004,7 +1258,7 @@ def create_or_update_order(order_object: Order) -> bool:
 
     try:
         # URL & Headers are included in the shipstation_client Session
-        response = order_object.shipstation_client.post(endpoint="/orders/createorder", data=json.dumps(payload))
+        response = order_object.shipstation_client.post(endpoint="/orders/createorder", data=_dumps(payload))
         response.raise_for_status()  # Raises an exception for HTTP error codes
         # Optionally, process the response or return True to indicate success
         #print("Order created or updated successfully:", response.json())
@@ -1016,20 +1270,91 @@ def create_or_update_order(order_object: Order) -> bool:
 
 
 
+def flush_order_batch(ss_client, list_of_orders):
+    """
+    Creates or updates a batch of orders of one ShipStation account with a single /orders/createorders request.
+
+    Args:
+        ss_client (ShipStation): The ShipStation connection object of the orders' account.
+        list_of_orders (list): Up to _CREATE_ORDERS_BATCH_SIZE Order objects.
+    Return:
+        tuple: (list of orders updated, list of orders that failed)
+    """
+    batch = []
+    payloads = []
+    failed = []
+    for order in list_of_orders:
+        try:
+            payloads.append(set_payload_for_update_order(order))
+            batch.append(order)
+        except Exception as e:
+            output.print_section_item(f"[X] Could not build update payload for order: {order.order_number}. Error: {e}", log_level="error", color="red")
+            failed.append(order)
+
+    if not payloads:
+        return [], failed
+
+    try:
+        # URL & Headers are included in the shipstation_client Session
+        response = ss_client.post(endpoint="/orders/createorders", data=_dumps(payloads))
+        response.raise_for_status()  # Raises an exception for HTTP error codes
+        results = response.json().get("results") or []
+    except requests.exceptions.RequestException as e:
+        output.print_section_item(f"[X] Bulk order update failed for {len(batch)} orders. Error: {e}", log_level="error", color="red")
+        return [], failed + batch
+
+    # One result per order, matched back on orderKey
+    results_by_key = {result.get("orderKey"): result for result in results}
+
+    updated = []
+    for order in batch:
+        result = results_by_key.get(order.order_key)
+        if result is not None and result.get("success"):
+            updated.append(order)
+        else:
+            reason = result.get("errorMessage") if result is not None else "missing from response"
+            output.print_section_item(f"[X] Order {order.order_number} not updated: {reason}", log_level="error", color="red")
+            failed.append(order)
+
+    return updated, failed
+
+
+
+def create_or_update_orders(list_of_orders):
+    """
+    Create or update many orders in ShipStation, _CREATE_ORDERS_BATCH_SIZE orders per request and account,
+    instead of one /orders/createorder request per order.
+
+    Args:
+        list_of_orders (list): The Order objects to update.
+    Return:
+        tuple: (list of orders updated, list of orders that failed)
+    """
+    orders_by_account = {}
+    for order in list_of_orders:
+        orders_by_account.setdefault(order.store_name, []).append(order)
+
+    updated = []
+    failed = []
+    for account_orders in orders_by_account.values():
+        ss_client = account_orders[0].shipstation_client
+        for start in range(0, len(account_orders), _CREATE_ORDERS_BATCH_SIZE):
+            batch_updated, batch_failed = flush_order_batch(ss_client, account_orders[start:start + _CREATE_ORDERS_BATCH_SIZE])
+            updated.extend(batch_updated)
+            failed.extend(batch_failed)
+
+    return updated, failed
+
+
+
+
 def hold_order(order):
     """
     Determines whether an order should be placed on hold and proceeds to move the order to the "on hold" status if the specified criteria are met.
     Adjust function as needed to detmerin hold criteria
     """
 
-    hold_order = False
-    hold_list = ["F3", "T3", "O4", "F2BFpM"]
-
-    for string in hold_list:
-        if order.Shipment.item_sku.startswith(string):
-            hold_order = True
-
-    if hold_order:
+    if order.Shipment.item_sku.startswith(_HOLD_SKU_PREFIXES):
         payload = {
             'orderId'       : int(order.order_id),
             'holdUntilDate' : "2024-05-03"
@@ -1037,7 +1362,7 @@ def hold_order(order):
 
         try:
             # URL & Headers are included in the shipstation_client Session
-            response = order.shipstation_client.post(endpoint="/orders/holduntil", data=json.dumps(payload))
+            response = order.shipstation_client.post(endpoint="/orders/holduntil", data=_dumps(payload))
             response.raise_for_status()  # Raises an exception for HTTP error codes
 
             return True
@@ -1068,14 +1393,13 @@ def get_champion_rate(order, ups_best: tuple = None, usps_best: tuple = None, fe
     If the order is from Stallion's warehouse, it includes rates from UPS and USPS only (FedEx rate is excluded).
     The function then selects the champion rate based on the lowest price among the eligible rates and updates the order object with this rate.
     """
-    stallion_warehouse_ids = [665600, 1097040]
-
-    if order.order_warehouseId not in stallion_warehouse_ids:
-        list_of_rates = [rate for rate in [ups_best, usps_best, fedex_best] if rate is not None]
-    else: # Order ships from Stallion Warehouse & they do not ship Fedex
-        list_of_rates = [rate for rate in [ups_best, usps_best] if rate is not None]
+    # Order ships from Stallion Warehouse & they do not ship Fedex
+    if order.order_warehouseId in _STALLION_WAREHOUSE_IDS:
+        candidates = (ups_best, usps_best)
+    else:
+        candidates = (ups_best, usps_best, fedex_best)
 
-    champion_rate = min(list_of_rates, key=lambda x: x["price"])
+    champion_rate = min((rate for rate in candidates if rate is not None), key=_BY_PRICE)
     order.winning_rate = champion_rate # Example:  {'carrierCode': 'ups', 'serviceCode': 'UPS® Ground', 'price': 12.62}
 
     return None
@@ -1,8 +1,7 @@
 import boto3
+import gzip
 from botocore.config import Config
-from botocore.exceptions import ClientError
 import logging
-from io import BytesIO
 from datetime import datetime
 import pytz
 from shipstation_automation.config.config import TIMEZONE
@@ -18,33 +17,31 @@ class S3BucketIntegration:
         self.logger = logging.getLogger('integrations.aws')
 
     def upload_log_file(self, env: str, log_content: str) -> bool:
-        """Upload log file to S3, appending to existing file if present"""
-        
-        today = datetime.now(pytz.timezone(TIMEZONE)).strftime('%Y-%m-%d')
-        s3_key = f'{env}/{today}.log'
-        
-        try:
-            # Try to download existing log file for today
-            temp_file = BytesIO()
-            existing_content = ''
-            
-            try:
-                self.s3_client.download_fileobj(self.bucket_name, s3_key, temp_file)
-                temp_file.seek(0)
-                existing_content = temp_file.read().decode('utf-8')
-            except ClientError:
-                pass  # No existing file is fine, we'll create a new one
+        """
+        Upload the log of this run to S3 as its own object under the day's prefix.
 
-            # Combine contents if there was an existing file
-            combined_content = existing_content + log_content if existing_content else log_content
+        Each run writes {env}/{YYYY-MM-DD}/{HH-MM-SS-ffffff}.log.gz instead of downloading,
+        appending to and re-uploading one ever-growing daily file, so every run only
+        transfers its own log. List the day's prefix to read a full day.
 
-            # Upload combined content
-            upload_buffer = BytesIO(combined_content.encode('utf-8'))
-            self.s3_client.upload_fileobj(upload_buffer, self.bucket_name, s3_key)
+        The log is gzipped (level 6) and stored with Content-Encoding: gzip, so clients that
+        honour the header get plain text back; boto3's get_object returns the gzipped bytes.
+        """
+        now = datetime.now(pytz.timezone(TIMEZONE))
+        s3_key = f"{env}/{now.strftime('%Y-%m-%d')}/{now.strftime('%H-%M-%S-%f')}.log.gz"
+        
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Body=gzip.compress(log_content.encode('utf-8'), compresslevel=6),
+                ContentType='text/plain; charset=utf-8',
+                ContentEncoding='gzip'
+            )
             
             self.logger.info(f'Successfully uploaded {env} logs to S3: {s3_key}')
             return True
 
         except Exception as e:
-            self.logger.error(f'Failed to upload/append logs for {env}: {str(e)}')
-            return False
\ No newline at end of file
+            self.logger.error(f'Failed to upload logs for {env}: {str(e)}')
+            return False
@@ -1,13 +1,25 @@
 from .classes import ShipStation
 from dotenv import load_dotenv
 import os
+import threading
+from functools import lru_cache
 from shipstation_automation.utils.output_manager import OutputManager
 
 output = OutputManager(__name__)
 
+# Read the .env file once per process instead of on every get_secret call
+load_dotenv()
+
+# One pooled ShipStation client per account (upper-cased name), reused by every connect_to_api call
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+@lru_cache(maxsize=None)
 def get_secret(account_name):
     """
     Retrieves API credentials from environment variables.
+    Found credentials are cached per account_name; failures raise and are not cached, so a later call
+    (e.g. once app.py has loaded the secrets into the environment) looks them up again.
     
     Args:
         account_name (str): The name of the account to get credentials for
@@ -19,8 +31,6 @@ def get_secret(account_name):
         ValueError: If account_name is empty or credentials aren't found
     """
     try:
-        load_dotenv()
-
         if not account_name:
             error_msg = "Account name cannot be empty"
             output.print_section_item(f"[X] Error: {error_msg}", color="red")
@@ -47,16 +57,25 @@ def get_secret(account_name):
 def connect_to_api(account_name):
     """
         Connect to the ShipStation API using the API keys retrieved from Secrets Manager.
+        The client is created once per account and cached, so its keep-alive connections are reused.
 
         Args:
             uniqueID
         Return:
             object: A ShipStation connection objects.
     """
+    cache_key = account_name.upper() if account_name else account_name
+
+    with _CLIENTS_LOCK:
+        ss_client = _CLIENTS.get(cache_key)
+        if ss_client is not None:
+            return ss_client
+
+        # Account Credentials
+        api_key, api_secret = get_secret(account_name)
 
-    # Account Credentials
-    api_key, api_secret = get_secret(account_name)
+        # Connect to the ShipStation API, the client mounts its own pooled, retrying adapter
+        ss_client = ShipStation(key=api_key, secret=api_secret)
 
-    # Connect to the ShipStation API
-    ss_client = ShipStation(key=api_key, secret=api_secret)
-    return ss_client
+        _CLIENTS[cache_key] = ss_client
+        return ss_client
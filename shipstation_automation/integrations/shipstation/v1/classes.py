@@ -2,21 +2,83 @@
 import base64
 import json
 import pprint
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party packages
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Local module imports
 from .constants import *  # Consider replacing with specific imports
 from .models import *    # Consider replacing with specific imports
 
 
+# /orders/list filter name -> its camelCase query parameter, built once instead of per fetch_orders call
+_CAMEL = {key: ShipStationBase.to_camel_case(key) for key in ORDER_LIST_PARAMETERS}
+
+# ShipStation counts requests per key over a rolling minute, 40 until X-Rate-Limit-Limit says otherwise
+_RATE_WINDOW = 60.0
+_DEFAULT_RPM_LIMIT = 40
+
+
+def _dumps(payload):
+    """Serializes a request body to compact UTF-8 JSON bytes, ready to hand to requests as `data`."""
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+class _AIMDLimiter:
+    """
+    Caps in-flight requests with additive-increase / multiplicative-decrease.
+
+    The limit grows by `increase` after a healthy response and is multiplied by `decrease`
+    when ShipStation pushes back (429 / 5xx / rate limit almost spent), staying within
+    [min_limit, max_limit]. Used as a context manager around each request.
+    """
+
+    def __init__(self, initial=8, min_limit=1, max_limit=16, increase=0.5, decrease=0.5):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+        return False
+
+    def on_success(self):
+        with self._condition:
+            self.limit = min(self.max_limit, self.limit + self.increase)
+            self._condition.notify()
+
+    def on_backoff(self):
+        with self._condition:
+            self.limit = max(self.min_limit, self.limit * self.decrease)
+
+
 class ShipStation(ShipStationBase):
     """
     Handles the details of connecting to and querying a ShipStation account.
     """
 
+    # Debug output formatter, stateless so one instance serves every request
+    _PP = pprint.PrettyPrinter(indent=4)
+
     def __init__(self, key=None, secret=None, debug=False):
         """
         Connecting to ShipStation required an account and a
@@ -36,6 +98,25 @@ class ShipStation(ShipStationBase):
         self.timeout = 115.0
         self.debug = debug
         self.session = requests.Session()
+        # Every call goes to ssapi.shipstation.com: one host pool, large enough that concurrent
+        # order/tag/rate requests reuse warm connections. This is the only retry layer for ShipStation:
+        # gateway errors and 429s are retried (honouring Retry-After), and the last response is returned
+        # instead of raised so callers' status checks still apply. POSTs are not retried on a status,
+        # a createorder(s) the gateway timed out on may already have gone through. 500s are not
+        # retried either, getrates uses them for invalid packages.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 502, 503, 504],
+                allowed_methods=frozenset(['GET', 'PUT', 'DELETE']),
+                raise_on_status=False
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         encoded_credentials = base64.b64encode(f'{self.key}:{self.secret}'.encode('utf-8')).decode('utf-8')
         header = {
@@ -45,6 +126,34 @@ class ShipStation(ShipStationBase):
 
         self.session.headers.update(header)
         self.session.hooks["response"] = self.api_calls
+        # Concurrency of the verb methods, adjusted by api_calls from each response
+        self.limiter = _AIMDLimiter()
+        # Send times of the requests in the current rate window, see _throttle
+        self._req_times = deque()
+        self._rpm_limit = _DEFAULT_RPM_LIMIT
+        self._window_resume = 0.0
+        self._window_lock = threading.Lock()
+
+    def _throttle(self):
+        """
+        Blocks until one more request fits in the rolling rate window, then records it.
+        Waits only as long as the oldest request in the window needs to age out, or until the
+        reset ShipStation announced when the remaining calls ran out.
+        """
+        while True:
+            with self._window_lock:
+                now = time.monotonic()
+                while self._req_times and now - self._req_times[0] >= _RATE_WINDOW:
+                    self._req_times.popleft()
+
+                if now < self._window_resume:
+                    wait = self._window_resume - now
+                elif len(self._req_times) < self._rpm_limit:
+                    self._req_times.append(now)
+                    return
+                else:
+                    wait = self._req_times[0] + _RATE_WINDOW - now
+            time.sleep(wait)
     
     def api_calls(self, r, *args, **kwargs):
         """
@@ -54,10 +163,16 @@ class ShipStation(ShipStationBase):
         calls_left = r.headers.get('X-Rate-Limit-Remaining')
         time_left = r.headers.get('X-Rate-Limit-Reset')
 
-        # Check if response is valid JSON before proceeding
-        try:
-            r.json()
-        except:
+        # ShipStation is pushing back, halve the allowed concurrency
+        if r.status_code == 429 or r.status_code >= 500:
+            self.limiter.on_backoff()
+        elif calls_left is not None and int(calls_left) <= 2:
+            self.limiter.on_backoff()
+        elif r.ok:
+            self.limiter.on_success()
+
+        # Check the response is JSON from its header, the caller parses the body itself
+        if 'application/json' not in r.headers.get('Content-Type', ''):
             # If not JSON, likely a rate limit or server error
             print(f"Non-JSON response received. Headers: {r.headers}")
             print(f"Status code: {r.status_code}")
@@ -67,11 +182,18 @@ class ShipStation(ShipStationBase):
 
         # Handle rate limiting
         if calls_left is not None:
+            rpm_limit = r.headers.get('X-Rate-Limit-Limit')
+            if rpm_limit is not None:
+                self._rpm_limit = int(rpm_limit)
+
             calls_left = int(calls_left)
             if calls_left <= 2:
-                sleep_time = 5 if time_left is None else int(time_left)
-                print(f"Rate limit approaching. Calls left: {calls_left}. Sleeping for {sleep_time} seconds")
-                time.sleep(sleep_time)
+                # Other clients share this key's quota: hold new requests until the reset
+                # instead of blocking the thread that received this response
+                pause = 5 if time_left is None else int(time_left)
+                print(f"Rate limit approaching. Calls left: {calls_left}. Holding requests for {pause} seconds")
+                with self._window_lock:
+                    self._window_resume = max(self._window_resume, time.monotonic() + pause)
         else:
             # If headers are missing, implement a conservative delay
             print("Rate limit headers missing. Using default delay")
@@ -87,62 +209,73 @@ class ShipStation(ShipStationBase):
     def get_orders(self):
         return self.orders
 
-    def submit_orders(self):
-        for order in self.orders:
-            self.post(endpoint="/orders/createorder", data=json.dumps(order.as_dict()))
+    def submit_orders(self, max_workers=8):
+        """
+        Posts every added order to /orders/createorder, up to `max_workers` at a time over the pooled session.
+        The rate limit hook (api_calls) still backs off when X-Rate-Limit-Remaining runs low.
+
+        Returns:
+            A list of <Response [code]> objects, in the same order as the added orders.
+        """
+        payloads = [_dumps(order.as_dict()) for order in self.orders]
+        if not payloads:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(payloads))) as executor:
+            return list(executor.map(lambda data: self.post(endpoint="/orders/createorder", data=data), payloads))
 
     def get(self, endpoint="", payload=None):
         url = "{}{}".format(self.url, endpoint)
-        r = self.session.get(
-            url, auth=(self.key, self.secret), params=payload, timeout=self.timeout
-        )
+        self._throttle()
+        with self.limiter:
+            r = self.session.get(url, params=payload, timeout=self.timeout)
         if self.debug:
-            pprint.PrettyPrinter(indent=4).pprint(r.json())
+            self._PP.pprint(r.json())
 
         return r
 
     def post(self, endpoint="", data=None):
         url = "{}{}".format(self.url, endpoint)
-        headers = {"content-type": "application/json"}
-        r = self.session.post(
-            url,
-            auth=(self.key, self.secret),
-            data=data,
-            headers=headers,
-            timeout=self.timeout,
-        )
+        # Content-Type and Authorization come from the session headers set in __init__
+        self._throttle()
+        with self.limiter:
+            r = self.session.post(
+                url,
+                data=data,
+                timeout=self.timeout,
+            )
         if self.debug:
-            pprint.PrettyPrinter(indent=4).pprint(r.json())
+            self._PP.pprint(r.json())
 
         return r
 
     def put(self, endpoint="", data=None):
         url = "{}{}".format(self.url, endpoint)
-        headers = {"content-type": "application/json"}
-        r = self.session.put(
-            url,
-            auth=(self.key, self.secret),
-            data=data,
-            headers=headers,
-            timeout=self.timeout,
-        )
+        # Content-Type and Authorization come from the session headers set in __init__
+        self._throttle()
+        with self.limiter:
+            r = self.session.put(
+                url,
+                data=data,
+                timeout=self.timeout,
+            )
         if self.debug:
-            pprint.PrettyPrinter(indent=4).pprint(r.json())
+            self._PP.pprint(r.json())
 
         return r
     
     def delete(self, endpoint="", data=None):
         url = "{}{}".format(self.url, endpoint)
-        headers = {"content-type": "application/json"}
-        r = self.session.delete(
-            url,
-            auth=(self.key, self.secret),
-            data=data,
-            headers=headers,
-            timeout=self.timeout,
-        )
+        # Content-Type and Authorization come from the session headers set in __init__
+        self._throttle()
+        with self.limiter:
+            r = self.session.delete(
+                url,
+                data=data,
+                timeout=self.timeout,
+            )
         if self.debug:
-            pprint.PrettyPrinter(indent=4).pprint(r.json())
+            self._PP.pprint(r.json())
 
         return r
     
@@ -168,15 +301,34 @@ class ShipStation(ShipStationBase):
             return self.get(endpoint=f"/orders/{order_id}")
 
         # First fetch the internal ID using the order number
-        response = self.get(endpoint=f"/orders?orderNumber={order_id}")
+        internal_id = self.get_order_by_number(order_id)["orderId"]
+        return self.get(endpoint=f"/orders/{internal_id}")
+
+    def get_order_by_number(self, order_number: str) -> dict:
+        """
+        Fetches an order by its order number with a single request.
+
+        /orders?orderNumber= returns the same order schema as /orders/{orderId}, wrapped in an
+        orders[] list, so callers that only need the order data can skip get_order's second request.
+
+        Args:
+            order_number (str): The order number of the order.
+
+        Returns:
+            dict: The first order ShipStation returned for the order number.
+
+        Raises:
+            IndexError: If no order is found with the given order number.
+            requests.exceptions.HTTPError: If the API request fails.
+        """
+        response = self.get(endpoint=f"/orders?orderNumber={order_number}")
         response.raise_for_status()
-        
-        orders = response.json().get("orders", [])
+
+        orders = json.loads(response.content).get("orders", [])
         if not orders:
-            raise IndexError(f"No order found with order number: {order_id}")
-        
-        internal_id = orders[0]["orderId"]
-        return self.get(endpoint=f"/orders/{internal_id}")
+            raise IndexError(f"No order found with order number: {order_number}")
+
+        return orders[0]
 
     def fetch_orders(self, parameters={}):
         """
@@ -196,7 +348,7 @@ class ShipStation(ShipStationBase):
                 >>> ss.fetch_orders(parameters={'order_status': 'shipped', 'page': '2'})
         """
         self.require_type(parameters, dict)
-        invalid_keys = set(parameters.keys()).difference(ORDER_LIST_PARAMETERS)
+        invalid_keys = parameters.keys() - _CAMEL.keys()
 
         if invalid_keys:
             raise AttributeError(
@@ -204,11 +356,41 @@ class ShipStation(ShipStationBase):
             )
 
         valid_parameters = {
-            self.to_camel_case(key): value for key, value in parameters.items()
+            _CAMEL[key]: value for key, value in parameters.items()
         }
 
         return self.get(endpoint="/orders/list", payload=valid_parameters)
 
+    def iter_orders(self, parameters=None):
+        """
+            Yield every order matching `parameters`, one page at a time.
+
+            Page N is parsed and its orders yielded before page N+1 is requested, so only one
+            page is held in memory and the caller can work on orders while the next page loads.
+
+            Args:
+                parameters (dict): Same filters as fetch_orders, 'page' is managed here.
+
+            Raises:
+                requests.exceptions.HTTPError: If a page request fails.
+
+            Examples:
+                >>> for order in ss.iter_orders({'order_status': 'awaiting_shipment'}):
+                ...     print(order['orderNumber'])
+        """
+        parameters = dict(parameters or {})
+        page = 1
+        total_pages = 1
+        while page <= total_pages:
+            parameters['page'] = page
+            response = self.fetch_orders(parameters=parameters)
+            response.raise_for_status()
+
+            body = json.loads(response.content)
+            total_pages = body.get('pages') or 0
+            yield from body.get('orders', [])
+            page += 1
+
     def fetch_webhook(self, batch_id):
         '''
             Fetches orders based off of a webhook payload. 
@@ -255,6 +437,18 @@ class ShipStation(ShipStationBase):
         """
         return self.get(endpoint=f"/shipments?orderId={order_id}")
     
+    def get_order_with_shipment(self, order_id: int):
+        """
+        Fetches an order and its shipments concurrently over the pooled session.
+
+        Returns:
+            tuple: (<Response [code]> for /orders/{order_id}, <Response [code]> for /shipments?orderId={order_id})
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            order = executor.submit(self.get_order, order_id)
+            shipment = executor.submit(self.get_shipment, order_id)
+            return order.result(), shipment.result()
+    
     def void_label(self, data=None):
         """
         Voids a shipping label using the ShipStation API.
@@ -331,3 +525,14 @@ class ShipStation(ShipStationBase):
         """
         return self.get(endpoint="/accounts/listtags")
 
+    def startup_fetch(self, endpoints=("/carriers", "/accounts/listtags", "/warehouses", "/stores")):
+        """
+        Fetches the account reference data used at startup in parallel over the pooled session.
+
+        Returns:
+            dict: endpoint -> <Response [code]>, one entry per requested endpoint.
+        """
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as executor:
+            responses = executor.map(lambda endpoint: self.get(endpoint=endpoint), endpoints)
+            return dict(zip(endpoints, responses))
+
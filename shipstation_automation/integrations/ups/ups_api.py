@@ -1,12 +1,20 @@
+import json
 import os
-import uuid
+import tempfile
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from urllib.parse import quote_plus
-from typing import Dict, Optional, Any
+from functools import lru_cache
+from urllib.parse import quote_plus, urlparse
+from typing import Dict, List, Optional, Any
 from dotenv import load_dotenv
 
+from shipstation_automation.utils.utils import load_cached_token, save_cached_token, clear_cached_token
 from shipstation_automation.schemas.ups_schema import (
     UPSAuthCredentials, 
     UPSAuthResponse,
@@ -16,23 +24,104 @@ from shipstation_automation.schemas.ups_schema import (
 )
 
 
+_DEFAULT_BASE_URL = 'https://onlinetools.ups.com'
+
+# Token shared by every UPSOAuth in this container (warm Lambda starts, parallel workers).
+# Hosts other than production (e.g. wwwcie.ups.com) get their own file, see _token_cache_path
+_TOKEN_CACHE_PATH = os.path.join(tempfile.gettempdir(), '.ups_token.json')
+# Tokens are refreshed this many seconds before they actually expire
+_TOKEN_REFRESH_MARGIN = 60
+
+# Read .env once per process rather than on every UPSOAuth construction
+load_dotenv()
+
+
+@lru_cache(maxsize=1)
+def get_ups_credentials() -> UPSAuthCredentials:
+    """
+    Returns the UPS OAuth credentials, read from the environment once.
+
+    Read lazily on first use rather than at import: app.py loads the credentials from
+    Secrets Manager into os.environ after this module has been imported.
+    """
+    return UPSAuthCredentials(
+        client_id=os.getenv('API_KEY_LENTICS_UPS'),
+        client_secret=os.getenv('API_SECRET_LENTICS_UPS')
+    )
+
+
+# One pooled session for every UPSAPIClient in the process, created on first use
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Returns the process-wide UPS session, creating it on first use.
+    Sharing it lets every client reuse the same warm connections instead of opening its own pool.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            # Keep warm connections to UPS, gateway errors and 429s are retried
+            adapter = HTTPAdapter(
+                pool_connections=2,
+                pool_maxsize=64,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 502, 503, 504],
+                    allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+                    raise_on_status=False
+                )
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            # Headers that never change ride on the session, get_headers only adds the per-request ones
+            session.headers.update({
+                'Content-Type': 'application/json',
+                'Accept': 'application/json',
+                'transactionSrc': 'testing',
+            })
+            _SESSION = session
+        return _SESSION
+
+
+def _token_cache_path(base_url: str) -> str:
+    """Token cache file for `base_url`, so test and production tokens never overwrite each other."""
+    if base_url == _DEFAULT_BASE_URL:
+        return _TOKEN_CACHE_PATH
+    return os.path.join(tempfile.gettempdir(), f'.ups_token.{urlparse(base_url).hostname}.json')
+
+
 class UPSOAuth:
     """
     Class for handling UPS API authentication with OAuth.
     """
     
-    def __init__(self):
-        load_dotenv()
-        # Use UPSAuthCredentials to store credentials
-        self.credentials = UPSAuthCredentials(
-            client_id=os.getenv('API_KEY_LENTICS_UPS'),
-            client_secret=os.getenv('API_SECRET_LENTICS_UPS')
-        )
-        self.token_endpoint = 'https://onlinetools.ups.com/security/v1/oauth/token'
+    def __init__(self, session: Optional[requests.Session] = None, base_url: str = _DEFAULT_BASE_URL):
+        """
+        Args:
+            session: Session used for token requests. UPSAPIClient passes its own so token and
+                API calls share one pooled connection to UPS.
+            base_url: UPS host to authenticate against, e.g. 'https://wwwcie.ups.com' for testing.
+        """
+        self.session = session if session is not None else requests.Session()
+        self.credentials = get_ups_credentials()
+        self.token_endpoint = f'{base_url}/security/v1/oauth/token'
+        self.token_cache_path = _token_cache_path(base_url)
         self.access_token: Optional[str] = None
         self.token_type: Optional[str] = None
         self.token_expiry: Optional[datetime] = None
 
+        # Start from a still-valid cached token, skipping the token request
+        access_token, expires_at = load_cached_token(self.token_cache_path, _TOKEN_REFRESH_MARGIN)
+        if access_token:
+            self.access_token = access_token
+            self.token_type = 'Bearer'
+            self.token_expiry = datetime.fromtimestamp(expires_at - _TOKEN_REFRESH_MARGIN, timezone.utc)
+
     def get_token(self) -> UPSAuthResponse:
         """
         Get a valid OAuth token, refreshing if necessary.
@@ -59,14 +148,15 @@ class UPSOAuth:
 
         data = {'grant_type': 'client_credentials'}
 
-        response = requests.post(self.token_endpoint, headers=headers, data=data, timeout=10)
+        response = self.session.post(self.token_endpoint, headers=headers, data=data, timeout=10)
         response.raise_for_status()
         token_info = response.json()
 
         self.access_token = token_info['access_token']
         self.token_type = 'Bearer'
         expires_in = int(token_info.get('expires_in', 3600))
-        self.token_expiry = datetime.now(timezone.utc) + timedelta(seconds=expires_in - 60)
+        self.token_expiry = datetime.now(timezone.utc) + timedelta(seconds=expires_in - _TOKEN_REFRESH_MARGIN)
+        save_cached_token(self.token_cache_path, self.access_token, time.time() + expires_in)
 
         return UPSAuthResponse(
             access_token=self.access_token,
@@ -74,30 +164,45 @@ class UPSOAuth:
             expires_in=self.token_expiry
         )
 
+    def invalidate_token(self, rejected_token: str) -> None:
+        """
+        Drops a token UPS rejected (401) before its recorded expiry, in memory and in the on-disk cache,
+        so the next get_token() requests a new one. A token already replaced by another thread is kept.
+        """
+        if self.access_token != rejected_token:
+            return
+        self.access_token = None
+        self.token_expiry = None
+        clear_cached_token(self.token_cache_path)
+
 
 class UPSAPIClient:
     """UPS API client to interact with UPS shipping services."""
     
-    def __init__(self):
-        """Initialize the UPS API client with OAuth authentication."""
-        self.base_url = 'https://onlinetools.ups.com'
-        self.oauth = UPSOAuth()
-        self.session = requests.Session()
+    def __init__(self, base_url: str = _DEFAULT_BASE_URL):
+        """
+        Initialize the UPS API client with OAuth authentication.
+
+        Args:
+            base_url: UPS host to call, e.g. 'https://wwwcie.ups.com' for the test environment
+        """
+        self.base_url = base_url
+        self.session = get_shared_session()
+        # Token requests go over the same pooled session
+        self.oauth = UPSOAuth(session=self.session, base_url=base_url)
 
     def get_headers(self) -> Dict[str, str]:
         """
-        Get headers for UPS API requests with authentication.
+        Get the per-request headers for UPS API requests, the static ones are set on the session.
         
         Returns:
-            Dict[str, str]: Headers for UPS API requests
+            Dict[str, str]: Authorization and transId headers for one UPS API request
         """
         token = self.oauth.get_token()
         return {
             'Authorization': f"{token.token_type} {token.access_token}",
-            'Content-Type': 'application/json',
-            'Accept': 'application/json',
-            'transactionSrc': 'testing',
-            'transId': str(uuid.uuid4()),
+            # UPS caps transId at 32 characters, 16 random bytes in hex fill it exactly
+            'transId': os.urandom(16).hex(),
         }
 
     def make_request(
@@ -127,9 +232,15 @@ class UPSAPIClient:
 
         try:
             response = self.session.request(method, url, headers=headers, params=params, json=data)
+            if response.status_code == 401:
+                # The cached token was revoked before its recorded expiry, fetch a new one and try once more
+                self.oauth.invalidate_token(headers['Authorization'].split(' ', 1)[1])
+                headers = self.get_headers()
+                response = self.session.request(method, url, headers=headers, params=params, json=data)
             response.raise_for_status()
+            # Parse the body bytes directly, skipping requests' text decoding step
             if response.content:
-                return response.json()
+                return json.loads(response.content)
             return None
         except requests.exceptions.RequestException as e:
             print(f"[X] API request failed: {e}")
@@ -157,6 +268,36 @@ class UPSAPIClient:
             print(f"[X] Failed to get transit times: {e}")
             raise
 
+    def get_transit_times_batch(
+        self,
+        requests_list: List[TransitTimeRequest],
+        max_workers: int = 16,
+    ) -> List[Optional[TransitTimeResponse]]:
+        """
+        Get transit times for many shipments, up to `max_workers` requests in flight over the pooled session.
+        
+        Args:
+            requests_list: Transit time requests, one per shipment
+            max_workers: Maximum number of concurrent UPS requests
+            
+        Returns:
+            List[Optional[TransitTimeResponse]]: One response per request, in the same order,
+                None where the lookup failed (the error is already printed by get_transit_times)
+        """
+        if not requests_list:
+            return []
+
+        def transit_time_or_none(request: TransitTimeRequest) -> Optional[TransitTimeResponse]:
+            try:
+                return self.get_transit_times(request)
+            except Exception:
+                return None
+
+        # Fetch the token up front so the workers don't all race to refresh it
+        self.oauth.get_token()
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(requests_list))) as executor:
+            return list(executor.map(transit_time_or_none, requests_list))
+
 
 def create_ups_session() -> UPSAPIClient:
     """
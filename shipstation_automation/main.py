@@ -1,7 +1,11 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import threading
+
 import shipstation_automation.functions as functions
-#import shipstation_automation.ups_api as ups_api
 from shipstation_automation.usps_api import get_usps_best_rate
-from shipstation_automation.fedex_api import get_fedex_best_rate
+from shipstation_automation.fedex_api import get_fedex_best_rate, get_fedex_best_rates
 from shipstation_automation.utils.utils import list_account_tags
 import shipstation_automation.customer_log as cl
 from shipstation_automation.utils.output_manager import OutputManager
@@ -39,12 +43,68 @@ def initial_setup():
     return list_of_order_objects
 
 # =================== GLOBAL VARIABLES =========================
-# For orders that failed the process on their first attemp
-retry_list = []
+# Max orders processed concurrently by main()
+_MAX_ORDER_WORKERS = 16
+
+# Best rate per (carrier, rate_cache_key(order)) quoted during this run, least recently used first.
+# Orders of the same shape shipping from/to the same place get the same quotes, so they are asked once
+_RATE_CACHE = OrderedDict()
+_RATE_CACHE_LOCK = threading.Lock()
+_RATE_CACHE_SIZE = 10_000
+
+
+def rate_cache_key(order):
+    """
+    Every input the carrier quotes depend on: account, origin, full destination address, package
+    weight and dimensions, confirmation option, dates, and the ShipStation rates (service names
+    and prices) the winners are priced from. Orders only share quotes when all of these match.
+    """
+    shipment = order.Shipment
+    customer = order.Customer
+    return (
+        order.store_name, order.order_warehouseId, shipment.from_postal_code, shipment.from_city,
+        customer.country, customer.state, customer.city, customer.postal_code, customer.is_residential,
+        shipment.weight["value"], shipment.weight["units"],
+        shipment.length, shipment.width, shipment.height, shipment.units,
+        order.confirmation, order.ship_date, order.deliver_by_date,
+        tuple(sorted((carrier, tuple(map(tuple, rates))) for carrier, rates in order.rates.items()))
+    )
+
+
+def get_cached_rate(carrier, order, fetch_rate):
+    """
+    Returns fetch_rate(order), reusing the quote of an earlier order with the same rate_cache_key.
+    False (quote failed, the order is retried) is never cached.
+    """
+    key = (carrier, rate_cache_key(order))
+    with _RATE_CACHE_LOCK:
+        if key in _RATE_CACHE:
+            _RATE_CACHE.move_to_end(key)
+            return copy.deepcopy(_RATE_CACHE[key])
+
+    rate = fetch_rate(order)
+    if rate is not False:
+        with _RATE_CACHE_LOCK:
+            _RATE_CACHE[key] = copy.deepcopy(rate)
+            if len(_RATE_CACHE) > _RATE_CACHE_SIZE:
+                _RATE_CACHE.popitem(last=False)
+    return rate
+
+
+def quote_fedex(order):
+    # get_fedex_best_rate also sets the SmartPost date on the order, cache it along with the rate
+    fedex_best = get_fedex_best_rate(order)
+    if fedex_best is False:
+        return False
+    return fedex_best, order.Shipment.smart_post_date
 
 # =================== CORE PROGRAM FUNCTIONS =============================
 
 def initialize_order(order):
+    """
+    Return:
+        tuple: (ok, failure reason for the retry pass or None)
+    """
     output.print_section_item(f"[+] Starting Initialization for order: {order.order_key} | {order.store_name}", color="green")
     output.print_section_item("\n")
     # Multi Orders have unique conditions for setting the Dimensions
@@ -54,27 +114,27 @@ def initialize_order(order):
         if not successful:
             functions.tag_order(order, "No-Dims")
             output.print_section_item("[!] Warning: No dims for multi order products, skipping..\n", log_level="warning", color="yellow")
-            return False
+            return False, None
 
     if not order.deliver_by_date:
-        failure = (order, "No-DeliveryDate")
-        retry_list.append(failure)
-        return False
+        return False, "No-DeliveryDate"
     
     # Get rates for all carriers from ShipStation
     output.print_section_item("\n[+] Getting Shipstation rates for all carriers...", color="green")
     # Function fails if not dimenstions for order, function tags order with "No_Dims"
     if not functions.get_rates_for_all_carriers(order):
         output.print_section_item("[!] Warning: Could not get carrier rates for order, skipping\n", log_level="warning", color="yellow")
-        failure = (order, "No SS Carrier Rates") # Can be added in addition to "No-Dims Tag"
-        retry_list.append(failure)
-        return False
+        return False, "No SS Carrier Rates" # Can be added in addition to "No-Dims Tag"
     
-    return True
+    return True, None
 
 
 
 def set_winning_rate(order):
+    """
+    Return:
+        tuple: (ok, failure reason for the retry pass or None)
+    """
             
     # output.print_section_item("[+] Getting API Rates from all carriers...", color="green")
     # # When delivery to a PO Box, must use USPS shipping only
@@ -84,43 +144,70 @@ def set_winning_rate(order):
 
     output.print_section_item(f"[+] Order: {order.order_number}", color="green")
 
+    # The carrier quotes are independent network calls, request them at the same time
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        ups_future = executor.submit(get_cached_rate, "ups", order, order.ups_service.get_ups_best_rate)
+        usps_future = executor.submit(get_cached_rate, "usps", order, get_usps_best_rate)
+        # Reuse the FedEx batch prefetch on the first attempt
+        if order.fedex_rate_fetched:
+            fedex_future = None
+            order.fedex_rate_fetched = False # Retries quote FedEx again
+        else:
+            fedex_future = executor.submit(get_cached_rate, "fedex", order, quote_fedex)
+
+        ups_best = ups_future.result()
+        usps_best = usps_future.result()
+        if fedex_future is None:
+            fedex_best = order.fedex_best_rate
+        else:
+            fedex_quote = fedex_future.result()
+            if fedex_quote is False:
+                fedex_best = False
+            else:
+                fedex_best, order.Shipment.smart_post_date = fedex_quote
+
     # Get winning UPS rate
-    ups_best = order.ups_service.get_ups_best_rate(order)
-    output.print_section_item(f"[+] UPS best rate: {ups_best}", color="green")
-    raise SystemExit("End Test")
     if ups_best is False:
-        failure = (order, "No UPS Rate")
-        retry_list.append(failure)
-        return False
+        return False, "No UPS Rate"
     output.print_section_item(f"[+] UPS best rate: {ups_best}", color="green")
 
 
     # Get winning USPS rate
-    usps_best = get_usps_best_rate(order)
     if usps_best is False:
-        failure = (order, "No USPS Rate")
-        retry_list.append(failure)
-        return False
+        return False, "No USPS Rate"
     output.print_section_item(f"[+] USPS best rate: {usps_best}", color="green")
     
 
     # Get winning FedEx rate
-    fedex_best = get_fedex_best_rate(order)
     if fedex_best is False:
-        failure = (order, "No Fedex Rate")
-        retry_list.append(failure)
-        return False
+        return False, "No Fedex Rate"
     output.print_section_item(f"[+] FedEx best rate: {fedex_best}", color="green")
 
 
     # Compare all the winning rates against each other and update winniner to order.winning_rate
     functions.get_champion_rate(order, ups_best=ups_best, fedex_best=fedex_best, usps_best=usps_best)
     output.print_section_item(f"[+] Champion rate: {order.winning_rate}", color="green")
-    return True
+    return True, None
+
+
+
+def prefetch_fedex_rates(orders):
+    """
+    FedEx rate quotes are network bound, so quote every initialized order concurrently
+    (over the shared FedEx session) before the sequential rate selection runs.
+    """
+    output.print_section_item(f"[+] Prefetching FedEx rates for {len(orders)} orders...", color="green")
+    for order, fedex_best in zip(orders, get_fedex_best_rates(orders)):
+        order.fedex_best_rate = fedex_best
+        order.fedex_rate_fetched = True
 
 
 
 def set_shipping_for_order(order):
+    """
+    Return:
+        tuple: (ok, failure reason for the retry pass or None)
+    """
     output.print_section_header("\n---------- Setting shipping for orders ----------")
     # Set the shipping for the order
     output.print_section_item(f"\n[+] Setting shipping for order: {order.order_key}", color="green")
@@ -130,36 +217,60 @@ def set_shipping_for_order(order):
         output.print_section_item("[+] Successfully Updated Carrier on Shipstation", color="green")
     else:
         output.print_section_item(f"[X] Order shipping update not successful {order.order_key}", log_level="error", color="red")
-        failure = (order, "Shipping not set")
-        retry_list.append(failure)
 
     output.print_section_header("------------next order---------------------\n\n")
-    return True
+    if success:
+        return True, None
+    return False, "Shipping not set"
+
+
+
+def set_shipping_for_orders(orders):
+    """
+    Sets the shipping of every order with bulk /orders/createorders requests (100 orders each)
+    instead of one request per order. Updated orders are tagged "Ready".
+
+    Return:
+        tuple: (orders updated on ShipStation, [(order, "Shipping not set")] for the retry pass)
+    """
+    output.print_section_header("\n---------- Setting shipping for orders ----------")
+    updated, failed = functions.create_or_update_orders(orders)
+
+    for order in updated:
+        functions.queue_tag(order, "Ready")
+    functions.flush_tags()
+    output.print_section_item(f"[+] Successfully Updated Carrier on Shipstation for {len(updated)}/{len(orders)} orders", color="green")
+
+    for order in failed:
+        output.print_section_item(f"[X] Order shipping update not successful {order.order_key}", log_level="error", color="red")
+    return updated, [(order, "Shipping not set") for order in failed]
 
 
 
 def main():
-    global retry_list
-    retry_list = []
+    # Carrier prices can change between runs, a warm container must not reuse old quotes
+    with _RATE_CACHE_LOCK:
+        _RATE_CACHE.clear()
 
     def full_program(order):
-        if not initialize_order(order):
+        ok, failure = initialize_order(order)
+        if not ok:
             return False
-        
-        if not set_winning_rate(order):
-            return False
-        
-        if not set_shipping_for_order(order):
+
+        ok, failure = set_winning_rate(order)
+        if not ok:
             return False
-        return True
+
+        ok, failure = set_shipping_for_order(order)
+        return ok
     
     def half_program(order):   
-        if not set_winning_rate(order):
+        ok, failure = set_winning_rate(order)
+        if not ok:
             return False
-        
-        if not set_shipping_for_order(order):
-            return False
-        return True
+
+        ok, failure = set_shipping_for_order(order)
+        return ok
 
 # =======   START OF MAIN LOOP   ========
     # Set up the progam and get the list of orders and csv for customer logging
@@ -168,55 +279,76 @@ def main():
     # List of dictionaries containing customer data to be logged
     customer_data_log = []
 
-    for order in list_of_order_objects:
-        if order:
-            # Small requirement to PUT certain info for criteria
-            if not order.is_multi_order and order.Shipment.item_sku.startswith("P1xxc"):
-                functions.set_order_warehouse_location(order)
-            # If issue with any order, retry_list.append(order, reason) and continue to next order
-            if not full_program(order):
-                continue
-            
-            # Since the order was successful, log the customer data
-            customer_data = cl.parse_customer_data(order)
-            customer_data_log.append(customer_data)      
-
-    # Orders added to retry_list within the core functions
-    if retry_list: # Global var
-        reattempt_list = retry_list.copy()
-        retry_list = []
+    # For orders that failed the process on their first attempt: (order, reason)
+    retries = []
+
+    def prepare_order(order):
+        # Small requirement to PUT certain info for criteria
+        if not order.is_multi_order and order.Shipment.item_sku.startswith("P1xxc"):
+            functions.set_order_warehouse_location(order)
+        # If issue with any order, the reason comes back for the retry pass and we continue to next order
+        return initialize_order(order)
+
+    def reattempt(order, reason):
+        output.print_section_item(f"[!] Retrying Order: {order.order_key} because {reason}", log_level="warning", color="yellow")
+        if reason == "No-DeliveryDate" or reason == "No SS Carrier Rates":
+            successful = full_program(order)
+        elif reason == "No UPS Rate" or reason == "No USPS Rate" or reason == "No Fedex Rate":
+            successful = half_program(order)
+        elif reason == "Shipping not set":
+            successful, failure = set_shipping_for_order(order)
+        else:
+            return False
+
         # If orders fail on second attempt, tag them and give up
-        for order, reason in reattempt_list: # list of tuples
-            output.print_section_item(f"[!] Retrying Order: {order.order_key} because {reason}", log_level="warning", color="yellow")
-            if reason == "No-DeliveryDate" or reason == "No SS Carrier Rates":
-                successful = full_program(order)
-                if not successful:
-                    if functions.tag_order(order, reason):
-                        output.print_section_item("[!] Order tagged..", log_level="warning", color="yellow")
-                else:
-                    # Process was successful, add Customer data to the log
-                    customer_data = cl.parse_customer_data(order)
-                    customer_data_log.append(customer_data)   
-            
-            if reason == "No UPS Rate" or reason == "No USPS Rate" or reason == "No Fedex Rate":
-                successful = half_program(order)
-                if not successful:
-                    if functions.tag_order(order, reason):
-                        output.print_section_item("[!] Order tagged..", log_level="warning", color="yellow")
-                else:
-                    # Process was successful, add Customer data to the log
-                    customer_data = cl.parse_customer_data(order)
-                    customer_data_log.append(customer_data)  
-            
-            if reason == "Shipping not set":
-                successful = set_shipping_for_order(order)
-                if not successful:
-                    if functions.tag_order(order, reason):
-                        output.print_section_item("[!] Order tagged..", log_level="warning", color="yellow")
-                else:
+        if not successful:
+            if functions.tag_order(order, reason):
+                output.print_section_item("[!] Order tagged..", log_level="warning", color="yellow")
+        return successful
+
+    def run_stage(stage, orders):
+        """
+        Runs stage(order) for every order on the pool. Returns the orders that passed, in input order,
+        and adds the failures that carry a reason to `retries`.
+        """
+        passed = []
+        with ThreadPoolExecutor(max_workers=_MAX_ORDER_WORKERS) as executor:
+            for order, (ok, failure) in zip(orders, executor.map(stage, orders)):
+                if ok:
+                    passed.append(order)
+                elif failure:
+                    retries.append((order, failure))
+        return passed
+
+    # Orders are network bound (ShipStation, UPS, USPS, FedEx), so several are processed at once.
+    # executor.map keeps the results in the order of the input list
+    orders = [order for order in list_of_order_objects if order]
+    initialized_orders = run_stage(prepare_order, orders)
+
+    # Quote FedEx for the whole batch at once instead of one blocking request per order
+    prefetch_fedex_rates(initialized_orders)
+
+    rated_orders = run_stage(set_winning_rate, initialized_orders)
+
+    # Shipping is set in bulk, failures come back as "Shipping not set"
+    shipped_orders, shipping_failures = set_shipping_for_orders(rated_orders)
+    retries.extend(shipping_failures)
+
+    # Only orders whose shipping was set are logged here, failed ones are logged if their retry succeeds
+    for order in shipped_orders:
+        # Since the order was successful, log the customer data
+        customer_data = cl.parse_customer_data(order)
+        customer_data_log.append(customer_data)      
+
+    # Orders that failed in the core functions get a second attempt
+    if retries:
+        with ThreadPoolExecutor(max_workers=_MAX_ORDER_WORKERS) as executor:
+            results = executor.map(lambda failure: reattempt(*failure), retries)
+            for (order, reason), successful in zip(retries, results):
+                if successful:
                     # Process was successful, add Customer data to the log
                     customer_data = cl.parse_customer_data(order)
-                    customer_data_log.append(customer_data)  
+                    customer_data_log.append(customer_data)
 
     # Log customer data for all successful order processes
     output.print_section_item("Logging Customer info...", color="green")
@@ -1,20 +1,27 @@
 from shipstation_automation.utils.output_manager import OutputManager
 import shipstation_automation.functions as functions
 from shipstation_automation.integrations.shipstation.v1.api import connect_to_api as ShipStation
-from shipstation_automation.fedex_api import create_fedex_session
+from shipstation_automation.fedex_api import get_fedex_session
 from shipstation_automation.integrations.ups.ups_api import UPSAPIClient
 from shipstation_automation.automations.initialization import initialize_orders
 
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import itertools
 import traceback
-import time
 
 output = OutputManager(__name__)
 
+# Max order list pages requested concurrently by fetch_all_awaiting_shipment_order_ids
+_MAX_PAGE_WORKERS = 10
+
+@lru_cache(maxsize=1)
 def check_aws_connection():
     """
     Verifies AWS credentials are available either through EC2 instance role
     or local AWS configuration. Raises SystemExit if no credentials are found.
+    A successful check is remembered for the life of the process; a failure raises and is checked again next time.
     """
     import boto3
     from botocore.exceptions import NoCredentialsError, ClientError
@@ -26,9 +33,20 @@ def check_aws_connection():
         output.print_section_item("[X] Program Cancelled - AWS credentials not found", color="red")
         raise SystemExit("[X] Program Cancelled - AWS credentials not found")
 
+@lru_cache(maxsize=1)
+def get_ups_client():
+    """
+    Returns the process-wide UPSAPIClient, created (and its token loaded) on first use.
+    """
+    return UPSAPIClient()
+
+
 def create_clients(account_name):
     '''
     This function is used to set up the program and intiated the data into python object
+    The ShipStation client is cached per account by connect_to_api and the UPS client per process,
+    so calling this again reuses their pooled sessions. The FedEx session is shared too; fetching it
+    again only refreshes its token when it is about to expire.
     '''
     # Set up the progam and get the list of orders and csv for customer logging
     print("======= Starting Initial Setup =======")
@@ -37,9 +55,9 @@ def create_clients(account_name):
     print("Connecting to the ShipStation API...")
     ss_client = ShipStation(account_name)
     print("[+] Connected to the ShipStation API!\n\n")
-    fedex_client = create_fedex_session()
+    fedex_client = get_fedex_session()
     print("[+] Connected to the FedEx API!\n\n")
-    ups_client = UPSAPIClient()
+    ups_client = get_ups_client()
     print("[+] Connected to the UPS API!\n\n")
     # usps_client = USPSAPI()
     # print("[+] Connected to the USPS API!\n\n")
@@ -50,30 +68,24 @@ def create_clients(account_name):
     return ss_client, fedex_client, ups_client
 
 
-def fetch_orders_with_retry(ss_client, params, max_retries, delay=2):
+def fetch_orders_with_retry(ss_client, params):
     """
-    Attempts to fetch all orders with a specified number of retries for each page.
+    Fetches one page of orders. Retries happen in the ShipStation client's pooled session
+    (urllib3 Retry with backoff on connection errors, 429 and gateway errors), not here.
 
     Args:
         ss_client (ShipStation): The ShipStation connection object.
         params (dict): Parameters for the fetch_orders request.
-        max_retries (int): Maximum number of retries for each page.
-        delay (int): Delay between retries in seconds.
 
     Returns:
-        list: A list of all orders (parsed from the response JSON).
+        A <Response [code]> object, or None if the page could not be fetched.
     """
-    for attempt in range(max_retries):
-        try:
-            response = ss_client.fetch_orders(parameters=params)
-            response.raise_for_status()  # Raises an HTTPError for bad responses (4xx/5xx)
-            break  # Exit the retry loop if the request is successful
-        except Exception as e:
-            print(f"[X] Attempt {attempt+1} failed with error: {e}")
-            time.sleep(delay)  # Wait before retrying
-    else:
-        print(f"[X] Failed to fetch page after {max_retries} attempts.")
-        return None  # Return None if any page fails after max retries
+    try:
+        response = ss_client.fetch_orders(parameters=params)
+        response.raise_for_status()  # Raises an HTTPError for bad responses (4xx/5xx)
+    except Exception as e:
+        print(f"[X] Failed to fetch page: {e}")
+        return None
     return response
 
 
@@ -88,10 +100,9 @@ def fetch_all_awaiting_shipment_order_ids(ss_client):
         output.print_section_header("🔍 Fetching all awaiting shipment order IDs")
         
         # Initialize variables
-        page = 1
         page_size = 100  # Use larger page size for efficiency when just getting IDs
         all_orders = []
-        has_more_pages = True
+        seen_order_ids = set()
         
         # First request to get total pages
         parameters = {
@@ -102,10 +113,10 @@ def fetch_all_awaiting_shipment_order_ids(ss_client):
             'sort_dir': 'ASC'
         }
         
-        response = fetch_orders_with_retry(ss_client, parameters, max_retries=10, delay=5)
+        response = fetch_orders_with_retry(ss_client, parameters)
         
-        if response.status_code != 200:
-            output.print_section_item(f"[X] Error fetching orders: {response.status_code}", color="red")
+        if response is None or response.status_code != 200:
+            output.print_section_item(f"[X] Error fetching orders: {getattr(response, 'status_code', None)}", color="red")
             return []
             
         page_data = response.json()
@@ -113,35 +124,36 @@ def fetch_all_awaiting_shipment_order_ids(ss_client):
         total_orders = page_data.get('total', 0)
         
         output.print_section_item(f"[+] Found {total_orders} orders across {total_pages} pages", color="green")
-        
-        # Process all pages to collect order IDs
-        while page <= total_pages:
+
+        def fetch_page(page):
             output.print_section_item(f"[+] Fetching order IDs from page {page}/{total_pages}", color="green")
-            
-            # Skip first page fetch since we already have it
-            if page > 1:
-                parameters['page'] = str(page)
-                response = fetch_orders_with_retry(ss_client, parameters, max_retries=10, delay=5)
-                
-                if response.status_code != 200:
-                    output.print_section_item(f"[X] Error fetching page {page}: {response.status_code}", color="red")
-                    page += 1
+            return fetch_orders_with_retry(ss_client, {**parameters, 'page': str(page)})
+
+        # Pages 2..N are requested concurrently now that the page count is known. The client's
+        # rate window keeps the burst within ShipStation's per-minute limit
+        with ThreadPoolExecutor(max_workers=_MAX_PAGE_WORKERS) as executor:
+            other_pages = executor.map(fetch_page, range(2, total_pages + 1))
+            responses = itertools.chain([(1, response)], zip(range(2, total_pages + 1), other_pages))
+
+            # Process all pages to collect order IDs
+            for page, response in responses:
+                if response is None or response.status_code != 200:
+                    output.print_section_item(f"[X] Error fetching page {page}: {getattr(response, 'status_code', None)}", color="red")
                     continue
-                    
-                page_data = response.json()
-            
-            # Extract order IDs and numbers from this page
-            page_orders = page_data.get('orders', [])
-            page_order_data = [
-                {"orderId": order.get('orderId'), "orderNumber": order.get('orderNumber')} 
-                for order in page_orders if order.get('orderId')
-            ]
-            
-            # Add to our list
-            all_orders.extend(page_order_data)
-            
-            output.print_section_item(f"[+] Collected {len(page_order_data)} orders from page {page} (total: {len(all_orders)})", color="green")
-            page += 1
+
+                # Extract order IDs and numbers from this page. Orders can shift between pages
+                # while they are fetched, so an order already collected is skipped
+                page_order_data = []
+                for order in response.json().get('orders', []):
+                    order_id = order.get('orderId')
+                    if order_id and order_id not in seen_order_ids:
+                        seen_order_ids.add(order_id)
+                        page_order_data.append({"orderId": order_id, "orderNumber": order.get('orderNumber')})
+
+                # Add to our list
+                all_orders.extend(page_order_data)
+
+                output.print_section_item(f"[+] Collected {len(page_order_data)} orders from page {page} (total: {len(all_orders)})", color="green")
             
         
         output.print_section_item(f"[+] Successfully collected {len(all_orders)} orders", color="green")
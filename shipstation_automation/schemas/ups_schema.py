@@ -110,11 +110,8 @@ class TransitTimeResponse:
     @classmethod
     def from_api_response(cls, response_data: Dict[str, Any]) -> 'TransitTimeResponse':
         """Create a TransitTimeResponse instance from API response data"""
-        services = []
-        for service_data in response_data.get("emsResponse", {}).get("services", []):
-            services.append(UPSServiceOption.from_api_response(service_data))
-        
-        return cls(services=services)
+        services = response_data.get("emsResponse", {}).get("services", [])
+        return cls(services=[UPSServiceOption.from_api_response(service_data) for service_data in services])
 
 @dataclass
 class ShippingRate:
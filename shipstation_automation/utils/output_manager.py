@@ -1,10 +1,23 @@
 from typing import Optional
 import logging
-import pyfiglet
 
 # Import logger functions without creating circular imports
 from shipstation_automation.utils.logger import get_logger
 
+
+# ANSI color codes, built once instead of on every print_section_item call
+_COLOR_CODES = {
+    "red": '\033[91m',
+    "green": '\033[92m',
+    "yellow": '\033[93m',
+    "orange": '\033[38;2;255;165;0m',
+    "purple": '\033[95m'
+}
+_RESET = '\033[0m'
+
+# Rendered on the first print_banner call, pyfiglet is only imported then
+_BANNER = None
+
 class OutputManager:
     """
     Centralized manager for terminal output and logging.
@@ -33,9 +46,11 @@ class OutputManager:
             Return:
                 None
         """
-        banner = "ShipStation Automation"
-        ascii_banner = pyfiglet.figlet_format(banner)
-        self.logger.info(ascii_banner)
+        global _BANNER
+        if _BANNER is None:
+            import pyfiglet
+            _BANNER = pyfiglet.figlet_format("ShipStation Automation")
+        self.logger.info(_BANNER)
     
     # Process start/end methods
     def print_process_start(self, process_name: Optional[str] = None):
@@ -72,23 +87,14 @@ class OutputManager:
             log_level: The logging level to use ("info", "warning", "error", "debug")
             color: Optional color for the text ("red", "green", "yellow", "orange", "purple")
         """
-        # ANSI color codes
-        color_codes = {
-            "red": '\033[91m',
-            "green": '\033[92m',
-            "yellow": '\033[93m',
-            "orange": '\033[38;2;255;165;0m',
-            "purple": '\033[95m',
-            "reset": '\033[0m'
-        }
-        
         # Create clean message for logging (without color codes)
         log_message = f"  {item_text}"
         
         # Add color with a custom attribute for the StreamHandler
-        if color and color.lower() in color_codes:
+        color_code = _COLOR_CODES.get(color.lower()) if color else None
+        if color_code:
             # Create a custom attribute that our filter will use
-            extras = {'colored_text': f"{color_codes[color.lower()]}{log_message}{color_codes['reset']}"}
+            extras = {'colored_text': f"{color_code}{log_message}{_RESET}"}
         else:
             extras = {'colored_text': log_message}
         
@@ -1,4 +1,4 @@
-import base64, requests, json, os
+import base64, fcntl, requests, json, os, random, time
 from datetime import datetime, timedelta
 import pytz
 
@@ -10,6 +10,104 @@ Most of this file is for saved functionsn that are being kept for potential futu
 """
 
 
+# HTTP statuses worth retrying, anything else will fail again the same way
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def retry_with_backoff(fn, *, max_attempts=3, base=1.0, cap=30.0, jitter=0.5, label="Request"):
+    """
+    Calls `fn` and retries it on transient failures with exponential backoff and jitter.
+
+    Connection errors, timeouts and HTTPErrors with a status in `_RETRYABLE_STATUS` are retried,
+    sleeping min(cap, base * 2**attempt * (1 + uniform(0, jitter))) seconds, or the server's
+    Retry-After value when one is sent. Any other error, or the last failed attempt, is re-raised.
+    """
+    for attempt in range(max_attempts):
+        retry_after = None
+        try:
+            return fn()
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+
+        except requests.exceptions.HTTPError as e:
+            status_code = e.response.status_code if e.response is not None else None
+            if status_code not in _RETRYABLE_STATUS:
+                raise
+            error = e
+            retry_after = e.response.headers.get("Retry-After")
+
+        if attempt == max_attempts - 1:
+            raise error
+
+        delay = min(cap, base * 2 ** attempt * (1 + random.uniform(0, jitter)))
+        if retry_after:
+            try:
+                delay = min(cap, float(retry_after))
+            except ValueError:
+                pass  # HTTP-date form, keep the computed backoff
+
+        print(f"[!] {label} failed ({error}), retrying in {delay:.1f}s")
+        time.sleep(delay)
+
+
+
+
+def load_cached_token(path, refresh_margin=60):
+    """
+    Returns (access_token, expires_at) from the on-disk token cache at `path`, where expires_at is
+    in epoch seconds, or (None, 0) when there is no cached token or it expires within `refresh_margin` seconds.
+    """
+    try:
+        with open(path, 'r') as file:
+            fcntl.flock(file, fcntl.LOCK_SH)
+            cached_token = json.load(file)
+    except (OSError, ValueError):
+        return None, 0
+
+    expires_at = cached_token.get("expires_at", 0)
+    if not cached_token.get("access_token") or expires_at - time.time() <= refresh_margin:
+        return None, 0
+    return cached_token["access_token"], expires_at
+
+
+def save_cached_token(path, access_token, expires_at):
+    """
+    Writes the token and its expiry (epoch seconds) to the token cache at `path`, readable by the owner only.
+    The exclusive lock keeps parallel workers from reading a half-written file.
+
+    Returns:
+        bool: True if the token was written.
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o600)
+        with os.fdopen(fd, 'w') as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            file.truncate()
+            json.dump({"access_token": access_token, "expires_at": expires_at}, file)
+        return True
+    except OSError as e:
+        print(f"[!] Could not cache access_token to {path}: {e}")
+        return False
+
+
+def clear_cached_token(path):
+    """
+    Deletes the token cache at `path`, e.g. after the API rejected the cached token before its recorded expiry.
+
+    Returns:
+        bool: True if there is no cached token left.
+    """
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return True
+    except OSError as e:
+        print(f"[!] Could not remove cached access_token {path}: {e}")
+        return False
+
+
 def get_product_dimensions(order, product_id):
     '''
     Requests product info from ShipStation API using shipstation generated product ID.